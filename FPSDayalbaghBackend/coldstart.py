@@ -0,0 +1,105 @@
+"""
+One cold start, measured phase by phase.
+
+Run in a fresh interpreter by `manage.py bench_cold_start` (or directly:
+`python -m FPSDayalbaghBackend.coldstart /api/products/`). It repeats what
+`wsgi.py` and the first requests do on a new serverless instance and prints a
+JSON object of phase durations in seconds:
+
+    interpreter       process launch -> this module running
+    django.setup      settings, app registry, models, signals
+    wsgi handler      middleware chain
+    app imports       the URLconf and every view/serializer module it pulls in
+    url resolution    resolving the benchmarked path
+    warm-up           FPSDayalbaghBackend.warmup (only with DJANGO_WARMUP=1)
+    first response    the benchmarked GET, end to end through the handler
+    second response   the same GET again, for a warm baseline
+    schema            GET /api/schema/
+"""
+import io
+import json
+import os
+import sys
+import time
+
+LAUNCHED_AT_ENV = "COLDSTART_LAUNCHED_AT"
+
+
+def _environ(path, host):
+    path, _, query = path.partition("?")
+    return {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": host,
+        "SERVER_PORT": "443",
+        "HTTP_HOST": host,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "https",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+
+def _get(handler, path, host):
+    status = []
+    body = handler(_environ(path, host), lambda s, headers, exc_info=None: status.append(s))
+    b"".join(body)
+    if hasattr(body, "close"):
+        body.close()
+    return int(status[0].split()[0])
+
+
+def main(path="/api/products/"):
+    started = time.time()
+    phases = {}
+    launched = os.environ.get(LAUNCHED_AT_ENV)
+    if launched:
+        phases["interpreter"] = started - float(launched)
+
+    def timed(name, fn):
+        t = time.perf_counter()
+        result = fn()
+        phases[name] = time.perf_counter() - t
+        return result
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "FPSDayalbaghBackend.settings")
+
+    import django
+    timed("django.setup", lambda: django.setup(set_prefix=False))
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    handler = timed("wsgi handler", WSGIHandler)
+
+    from importlib import import_module
+    timed("app imports", lambda: import_module(settings.ROOT_URLCONF))
+
+    from django.urls import Resolver404, get_resolver
+
+    def resolve():
+        try:
+            get_resolver().resolve(path.partition("?")[0])
+        except Resolver404:
+            pass
+    timed("url resolution", resolve)
+
+    if os.environ.get("DJANGO_WARMUP", "").lower() in ("1", "true", "yes"):
+        from FPSDayalbaghBackend.warmup import warm_up
+        timed("warm-up", warm_up)
+
+    host = next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith(".") and h != "*"), "localhost")
+    statuses = {
+        "first": timed("first response", lambda: _get(handler, path, host)),
+        "second": timed("second response", lambda: _get(handler, path, host)),
+        "schema": timed("schema", lambda: _get(handler, "/api/schema/", host)),
+    }
+    print(json.dumps({"phases": phases, "statuses": statuses}))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,25 @@
+"""
+Authentication for Vercel Cron Jobs.
+
+There is no worker process on this deployment, so periodic work (draining the
+product image queue, publishing catalog snapshots) runs as ordinary requests
+that Vercel sends on the schedules in `vercel.json`. Vercel makes a GET to each
+path with `Authorization: Bearer $CRON_SECRET` when the `CRON_SECRET`
+environment variable is set on the project; `IsVercelCron` admits exactly those
+requests. Without `CRON_SECRET` no request passes, and the endpoints remain
+available to admins only.
+"""
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+CRON_SECRET = getattr(settings, "CRON_SECRET", None)
+
+
+class IsVercelCron(BasePermission):
+    def has_permission(self, request, view):
+        if not CRON_SECRET:
+            return False
+        header = request.headers.get("Authorization", "")
+        return hmac.compare_digest(header.encode(), f"Bearer {CRON_SECRET}".encode())
@@ -0,0 +1,333 @@
+"""
+Bucket/backup sync engine.
+
+`pull_supabase_backup.py`, `push_backup_to_aws.py` and
+`migrate_supabase_to_aws.py` walk objects one by one and issue a `head_object`
+per key before a serial `put_object`. This module does the same job in a
+fixed number of listing calls plus one transfer per changed object:
+
+1. list both sides once (paginated `list_objects_v2`, or `os.walk` for a local
+   directory) into `{key: Entry}` maps,
+2. diff them in memory by key, size and ETag (see `needs_transfer`),
+3. transfer the differences on a thread pool, with multipart uploads and
+   downloads for large objects (boto3 clients are thread-safe), and
+4. append each completed transfer to a local JSON-lines manifest so an
+   interrupted run resumes without re-sending anything, and objects whose
+   ETags can't be compared (multipart uploads, local files) aren't re-sent on
+   every run just because their signatures differ.
+
+Uploaded objects get `Cache-Control: immutable` only when their key embeds
+a hash of their content (see `cache_control_for`); any other key can later
+hold different bytes under the same name.
+
+A location is either `s3://bucket[/prefix]` or a local directory, so the same
+engine pulls a backup, pushes one, or copies bucket to bucket. Everything
+takes explicit boto3 clients, which makes it easy to point at moto or MinIO.
+"""
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+# Keys named after a hash of their content: catalog snapshot shards
+# (products.snapshot) and bulk-attached photos (attach_product_images).
+# Uploads, variants and archives may be rewritten under the same name.
+CONTENT_ADDRESSED_KEYS = (
+    re.compile(r"(^|/)catalog/snapshots/[0-9a-f]{16}/"),
+    re.compile(r"(^|/)products/p\d+-[0-9a-f]{12}\.jpg$"),
+)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".avif": "image/avif",
+    ".pdf": "application/pdf",
+    ".apk": "application/vnd.android.package-archive",
+    ".gz": "application/gzip",
+}
+
+
+def guess_content_type(key):
+    return CONTENT_TYPES.get(os.path.splitext(key.lower())[1], "application/octet-stream")
+
+
+def cache_control_for(key):
+    """Cache-Control for a full bucket key: immutable only if content-addressed."""
+    if any(pattern.search(key) for pattern in CONTENT_ADDRESSED_KEYS):
+        return IMMUTABLE_CACHE_CONTROL
+    return DEFAULT_CACHE_CONTROL
+
+
+@dataclass(frozen=True)
+class Entry:
+    size: int
+    # S3 ETag without quotes; None for local files.
+    etag: Optional[str] = None
+    # Local files: mtime in ns, so the manifest can tell an edited file apart.
+    mtime_ns: Optional[int] = None
+
+    @property
+    def version(self):
+        return self.etag if self.etag is not None else f"mtime:{self.mtime_ns}"
+
+    def signature(self):
+        return [self.size, self.version]
+
+
+@dataclass
+class Location:
+    """`s3://bucket/prefix` (with a client) or a local directory."""
+    url: str
+    client: object = None
+
+    @property
+    def is_s3(self):
+        return self.url.startswith("s3://")
+
+    @property
+    def bucket(self):
+        return self.url[5:].split("/", 1)[0]
+
+    @property
+    def prefix(self):
+        parts = self.url[5:].split("/", 1) if self.is_s3 else []
+        prefix = parts[1] if len(parts) > 1 else ""
+        return prefix if not prefix or prefix.endswith("/") else prefix + "/"
+
+    @property
+    def root(self):
+        return os.path.abspath(self.url)
+
+    def path_for(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+
+def s3_client_from_env(env_prefix=""):
+    """
+    boto3 client configured from `<env_prefix>AWS_*` variables, the same names
+    the settings module and backup scripts use (e.g. SRC_/DST_ prefixes).
+    """
+    def env(name):
+        return (os.environ.get(f"{env_prefix}{name}") or "").strip() or None
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=env("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=env("AWS_SECRET_ACCESS_KEY"),
+        region_name=env("AWS_S3_REGION_NAME"),
+        endpoint_url=env("AWS_S3_ENDPOINT_URL"),
+        config=Config(
+            signature_version="s3v4",
+            s3={"addressing_style": env("AWS_S3_ADDRESSING_STYLE") or "path"},
+            # Room for every worker plus s3transfer's multipart threads.
+            max_pool_connections=64,
+        ),
+    )
+
+
+def list_entries(loc, subprefix=""):
+    """`{key: Entry}` for everything under the location (+ `subprefix`),
+    with keys relative to the location's own prefix."""
+    entries = {}
+    if loc.is_s3:
+        base = loc.prefix
+        paginator = loc.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=loc.bucket, Prefix=base + subprefix):
+            for obj in page.get("Contents") or []:
+                key = obj["Key"][len(base):]
+                if not key or key.endswith("/"):
+                    continue
+                entries[key] = Entry(size=obj["Size"], etag=obj["ETag"].strip('"'))
+        return entries
+
+    root = loc.root
+    if not os.path.isdir(root):
+        return entries
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            key = os.path.relpath(full, root).replace(os.sep, "/")
+            if subprefix and not key.startswith(subprefix):
+                continue
+            st = os.stat(full)
+            entries[key] = Entry(size=st.st_size, mtime_ns=st.st_mtime_ns)
+    return entries
+
+
+def _comparable_etag(etag):
+    # Multipart ETags aren't an MD5 of the body, so they can't be compared
+    # across sides that may have chunked differently.
+    return etag if etag and "-" not in etag else None
+
+
+def needs_transfer(src, dst, synced=None):
+    """
+    Decide whether `src` must be copied over `dst` (None if missing). `synced`
+    is the manifest record of the last transfer of this key, if any.
+    """
+    if dst is None:
+        return True
+    if synced:
+        if synced.get("src") != src.signature():
+            return True    # source changed since we last copied it
+        if synced.get("dst") == dst.signature():
+            return False   # both sides exactly as we left them
+    if src.size != dst.size:
+        return True
+    a, b = _comparable_etag(src.etag), _comparable_etag(dst.etag)
+    return a is not None and b is not None and a != b
+
+
+class Manifest:
+    """Append-only JSON-lines record of completed transfers for one src/dst pair."""
+
+    def __init__(self, path, pair):
+        self.path = path
+        self.pair = pair
+        self.records = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue   # torn last line from an interrupted run
+                    if rec.get("pair") == pair:
+                        self.records[rec["key"]] = rec
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def record(self, key, src, dst):
+        rec = {"pair": self.pair, "key": key, "src": src.signature(), "dst": dst.signature()}
+        self.records[key] = rec
+        if not self.path:
+            return
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(rec) + "\n")
+
+
+def plan(src, dst, subprefix="", manifest=None, force=False):
+    """Keys to transfer, as `[(key, src_entry)]` sorted by key, plus the two listings."""
+    src_entries = list_entries(src, subprefix)
+    dst_entries = list_entries(dst, subprefix)
+    todo = [
+        (key, entry)
+        for key, entry in sorted(src_entries.items())
+        if force or needs_transfer(entry, dst_entries.get(key), manifest.get(key) if manifest else None)
+    ]
+    return todo, src_entries, dst_entries
+
+
+def _transfer_config(multipart_threshold):
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=multipart_threshold,
+        max_concurrency=4,
+    )
+
+
+def _head(loc, key):
+    if loc.is_s3:
+        head = loc.client.head_object(Bucket=loc.bucket, Key=loc.prefix + key)
+        return Entry(size=head["ContentLength"], etag=head["ETag"].strip('"'))
+    st = os.stat(loc.path_for(key))
+    return Entry(size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+def transfer(src, dst, key, multipart_threshold=MULTIPART_THRESHOLD):
+    """Copy one object and return the destination's resulting Entry."""
+    cfg = _transfer_config(multipart_threshold)
+
+    if dst.is_s3:
+        dst_key = dst.prefix + key
+        extra = {"ContentType": guess_content_type(key), "CacheControl": cache_control_for(dst_key)}
+        if src.is_s3:
+            body = src.client.get_object(Bucket=src.bucket, Key=src.prefix + key)["Body"]
+            try:
+                dst.client.upload_fileobj(body, dst.bucket, dst_key, ExtraArgs=extra, Config=cfg)
+            finally:
+                body.close()
+        else:
+            dst.client.upload_file(src.path_for(key), dst.bucket, dst_key, ExtraArgs=extra, Config=cfg)
+    else:
+        path = dst.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if src.is_s3:
+            # s3transfer writes to a temp file and renames, so a crash never
+            # leaves a truncated file under the final name.
+            src.client.download_file(src.bucket, src.prefix + key, path, Config=cfg)
+        else:
+            tmp = f"{path}.part"
+            with open(src.path_for(key), "rb") as fin, open(tmp, "wb") as fout:
+                while chunk := fin.read(1024 * 1024):
+                    fout.write(chunk)
+            os.replace(tmp, path)
+    return _head(dst, key)
+
+
+def sync(src, dst, *, subprefix="", manifest=None, workers=8, force=False,
+         dry_run=False, multipart_threshold=MULTIPART_THRESHOLD, on_result=None):
+    """
+    Make `dst` hold every object in `src` (nothing is deleted from `dst`).
+
+    `on_result(key, entry, error)` is called from the calling thread as each
+    transfer finishes (`error` is None on success). Returns a stats dict.
+    """
+    todo, src_entries, _ = plan(src, dst, subprefix=subprefix, manifest=manifest, force=force)
+    stats = {
+        "listed": len(src_entries),
+        "skipped": len(src_entries) - len(todo),
+        "transferred": 0,
+        "failed": 0,
+        "bytes": 0,
+        "to_transfer": len(todo),
+    }
+    if dry_run:
+        stats["bytes"] = sum(entry.size for _, entry in todo)
+        if on_result:
+            for key, entry in todo:
+                on_result(key, entry, None)
+        return stats
+    if not todo:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(transfer, src, dst, key, multipart_threshold): (key, entry)
+            for key, entry in todo
+        }
+        try:
+            for fut in as_completed(futures):
+                key, entry = futures[fut]
+                try:
+                    dst_entry = fut.result()
+                except Exception as exc:
+                    stats["failed"] += 1
+                    if on_result:
+                        on_result(key, entry, exc)
+                    continue
+                if manifest:
+                    manifest.record(key, entry, dst_entry)
+                stats["transferred"] += 1
+                stats["bytes"] += entry.size
+                if on_result:
+                    on_result(key, entry, None)
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    return stats
@@ -292,6 +292,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # trigram lookups for product search
 
     # Third-party
     'rest_framework',
@@ -321,7 +322,8 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication plus a short-lived cache of the token's user
+        'users.authentication.CachedTokenAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',  # optional
     ),
     'COERCE_DECIMAL_TO_STRING': False,  # send Decimal fields as numbers, not strings
@@ -334,6 +336,9 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+# /api/schema/ serves the committed openapi/ files (see FPSDayalbaghBackend/
+# schema.py). Set OPENAPI_SCHEMA_LIVE=1 locally to regenerate it per request.
+OPENAPI_SCHEMA_LIVE = os.environ.get('OPENAPI_SCHEMA_LIVE') == '1'
 
 
 
@@ -384,6 +389,52 @@ else:
     }
     DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
 
+# ✅ Caches
+#   - default / catalog-local: per-instance memory, LRU-evicted at MAX_ENTRIES.
+#   - shared: seen by every instance (catalog pages + the catalog version, see
+#     products/catalog_cache.py). Redis when REDIS_URL is set, otherwise the
+#     `fps_cache` table in Postgres (always created by `migrate`,
+#     products/0012, so dropping REDIS_URL later needs no extra step).
+#     Locally (USE_SQLITE=1) a memory stand-in.
+REDIS_URL = (os.environ.get('REDIS_URL') or '').strip() or None
+if REDIS_URL:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+elif os.environ.get('USE_SQLITE') == '1':
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fps-shared',
+    }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'fps_cache',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    }
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fps-default',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'catalog-local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fps-catalog',
+        'OPTIONS': {'MAX_ENTRIES': 64},
+    },
+    'shared': SHARED_CACHE,
+}
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 300))
+# Token auth is only cached in Redis; the database tier costs more round-trips
+# than it saves (users/authentication.py).
+TOKEN_AUTH_CACHE = 'shared' if REDIS_URL else None
+
+# Shared secret Vercel sends with scheduled requests (the `crons` in
+# vercel.json); see FPSDayalbaghBackend/cron.py.
+CRON_SECRET = (os.environ.get('CRON_SECRET') or '').strip() or None
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
@@ -432,11 +483,20 @@ AWS_S3_OBJECT_PARAMETERS = {
 
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        # S3Boto3Storage with memoised, string-built public URLs (see module).
+        "BACKEND": "FPSDayalbaghBackend.storage.PublicS3Storage",
     },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
+    # Same bucket; catalog snapshot files are content-addressed and never
+    # rewritten, so CDNs and apps may cache them forever (products/snapshot.py).
+    "snapshots": {
+        "BACKEND": "FPSDayalbaghBackend.storage.PublicS3Storage",
+        "OPTIONS": {
+            "object_parameters": {"CacheControl": "public, max-age=31536000, immutable"},
+        },
+    },
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -451,3 +511,7 @@ FIREBASE_ADMIN_CREDENTIALS_FILE = BASE_DIR / "firebase-admin.json"
 BILLING_TRIGGER_STATUSES = {"PAID", "COMPLETED"}  # any you like (case-insensitive)
 BILLING_ONLINE_METHOD = "online"                  # or "upi"/"card"/"cod"
 ORDERS_INCLUDE_SHIPPING_PHONE_MATCH = True
+
+# Stock ledger admin shows only this many recent days unless "All" is picked;
+# older rows are archived by `manage.py archive_stock_movements`.
+STOCK_MOVEMENT_ADMIN_WINDOW_DAYS = 30
@@ -0,0 +1,99 @@
+"""
+Single-flight, stale-while-revalidate caching for expensive reads.
+
+A plain cache-aside read stampedes when a popular entry expires: every
+request that arrives before the first rebuild finishes runs the same query
+and serialization. `get_or_build()` stores each value with a "fresh until"
+time and keeps it for a further `stale` seconds after that. Once an entry
+goes stale, the first request to take a short lock in the shared cache
+rebuilds it inline, and everyone else keeps serving the stale value until
+it's replaced. With nothing to serve at all (first build, or a new catalog
+version), the other requests wait up to SINGLEFLIGHT_WAIT_SECONDS for the
+lock holder's result instead of rebuilding in parallel.
+
+There are no background workers on this deployment, so the rebuild always
+runs in the request that wins the lock. If the shared tier errors, the
+value is built directly.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE = getattr(settings, "SINGLEFLIGHT_CACHE", "shared")
+# How long a rebuild may hold the lock before another request may take over.
+LOCK_TIMEOUT = getattr(settings, "SINGLEFLIGHT_LOCK_SECONDS", 30)
+# How long a request with nothing to serve waits for another's rebuild.
+WAIT_SECONDS = getattr(settings, "SINGLEFLIGHT_WAIT_SECONDS", 5)
+POLL_SECONDS = 0.1
+
+
+def _try(fn, *args, default=None):
+    try:
+        return fn(*args)
+    except Exception:
+        logger.warning("Shared cache %s() failed", getattr(fn, "__name__", fn), exc_info=True)
+        return default
+
+
+def _fresh(entry):
+    return entry is not None and entry[1] > time.time()
+
+
+def get_or_build(key, build, *, fresh, stale=0, local=None, shared=SHARED_CACHE):
+    """
+    Return the cached value for `key`, calling `build()` at most once across
+    concurrent requests when it's missing or stale.
+
+    `fresh` is how long a built value is served as-is; `stale` how much longer
+    it may be served while a rebuild is in progress. `local` optionally names a
+    per-instance cache consulted before the shared one. Values must be
+    picklable and not None.
+    """
+    local_cache = caches[local] if local else None
+    entry = local_cache.get(key) if local_cache else None
+    if _fresh(entry):
+        return entry[0]
+
+    def store(value):
+        entry = (value, time.time() + fresh)
+        _try(shared_cache.set, key, entry, fresh + stale)
+        if local_cache:
+            local_cache.set(key, entry, fresh + stale)
+        return value
+
+    shared_cache = caches[shared]
+    try:
+        entry = shared_cache.get(key)
+    except Exception:
+        logger.warning("Shared cache unavailable; building %s uncached", key, exc_info=True)
+        return build()
+    if _fresh(entry):
+        if local_cache:
+            local_cache.set(key, entry, fresh + stale)
+        return entry[0]
+
+    lock_key = f"{key}:lock"
+    # A failing add() counts as winning: better a duplicate build than a wait.
+    if _try(shared_cache.add, lock_key, 1, LOCK_TIMEOUT, default=True):
+        try:
+            return store(build())
+        finally:
+            _try(shared_cache.delete, lock_key)
+
+    if entry is not None:
+        return entry[0]   # stale; the lock holder is refreshing it
+
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        entry = _try(shared_cache.get, key)
+        if entry is not None:
+            if local_cache:
+                local_cache.set(key, entry, fresh + stale)
+            return entry[0]
+    # The lock holder is slow or died; don't keep the client waiting.
+    return store(build())
@@ -0,0 +1,139 @@
+"""
+Default media storage.
+
+Product images are public objects (AWS_QUERYSTRING_AUTH = False), so their
+URLs are a pure function of the object name and the bucket settings. The
+stock `S3Boto3Storage.url()` still builds a boto3 client and runs the request
+signer for every call, which adds up when a catalog response renders thousands
+of images. `PublicS3Storage` formats those URLs with string operations and
+memoises them per name; anything that needs a signed or parameterised URL
+falls back to the stock implementation.
+
+Importing `storages.backends.s3boto3` pulls in boto3/botocore (~80 ms), so the
+real `S3Boto3Storage` is only built the first time something other than a
+public URL is needed (an upload, an exists() check, a signed URL). A cold
+instance serving a catalog GET never loads boto3 at all.
+"""
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings as django_settings
+from django.core.exceptions import SuspiciousOperation
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+from storages.utils import clean_name, safe_join
+
+URL_CACHE_SIZE = 8192
+
+# The settings public URLs depend on, with S3Boto3Storage's own defaults.
+_URL_SETTINGS = {
+    "bucket_name": ("AWS_STORAGE_BUCKET_NAME", None),
+    "querystring_auth": ("AWS_QUERYSTRING_AUTH", True),
+    "location": ("AWS_LOCATION", ""),
+    "custom_domain": ("AWS_S3_CUSTOM_DOMAIN", None),
+    "addressing_style": ("AWS_S3_ADDRESSING_STYLE", None),
+    "url_protocol": ("AWS_S3_URL_PROTOCOL", None),
+    "endpoint_url": ("AWS_S3_ENDPOINT_URL", None),
+    "region_name": ("AWS_S3_REGION_NAME", None),
+}
+
+
+@deconstructible
+class PublicS3Storage(Storage):
+    def __init__(self, **settings):
+        self._options = settings
+        self._backend = None
+        for attr, (name, default) in _URL_SETTINGS.items():
+            value = settings[attr] if attr in settings else getattr(django_settings, name, default)
+            setattr(self, attr, value)
+        self.url_protocol = self.url_protocol or "https:"
+        self._public_url = lru_cache(maxsize=URL_CACHE_SIZE)(self._build_public_url)
+
+    @property
+    def backend(self):
+        """The real S3Boto3Storage, created on first use."""
+        if self._backend is None:
+            from storages.backends.s3boto3 import S3Boto3Storage
+
+            self._backend = S3Boto3Storage(**self._options)
+        return self._backend
+
+    def __getattr__(self, name):
+        # bucket, connection, _normalize_name, file_overwrite, ...
+        if name.startswith("__") or name in ("_options", "_backend"):
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    # ---- public URLs, no boto3 ----
+
+    def _base_url(self):
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}"
+        region = self.region_name or "us-east-1"
+        # Same host forms botocore emits for unsigned URLs.
+        host = "s3.amazonaws.com" if region == "us-east-1" else f"s3.{region}.amazonaws.com"
+        if self.addressing_style == "virtual":
+            return f"https://{self.bucket_name}.{host}"
+        return f"https://{host}/{self.bucket_name}"
+
+    def _key(self, name):
+        try:
+            return safe_join(self.location, clean_name(name))
+        except ValueError:
+            raise SuspiciousOperation("Attempted access to '%s' denied." % name)
+
+    def _build_public_url(self, name):
+        key = self._key(name)
+        if self.custom_domain:
+            return f"{self.url_protocol}//{self.custom_domain}/{filepath_to_uri(key)}"
+        return f"{self._base_url()}/{quote(key, safe='/~')}"
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if self.querystring_auth or parameters or http_method:
+            return self.backend.url(name, parameters, expire, http_method)
+        return self._public_url(name)
+
+    # ---- everything else goes to S3Boto3Storage ----
+
+    def open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def save(self, name, content, max_length=None):
+        return self.backend.save(name, content, max_length=max_length)
+
+    def get_valid_name(self, name):
+        return self.backend.get_valid_name(name)
+
+    def get_alternative_name(self, file_root, file_ext):
+        return self.backend.get_alternative_name(file_root, file_ext)
+
+    def get_available_name(self, name, max_length=None):
+        return self.backend.get_available_name(name, max_length=max_length)
+
+    def generate_filename(self, filename):
+        return self.backend.generate_filename(filename)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def delete(self, name):
+        return self.backend.delete(name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def get_accessed_time(self, name):
+        return self.backend.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.backend.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.backend.get_modified_time(name)
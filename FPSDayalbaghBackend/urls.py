@@ -3,7 +3,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+from FPSDayalbaghBackend.schema import CachedSpectacularAPIView
 from users.views import home_view, privacy_policy_view, delete_account_view, CSRFTokenView
 
 urlpatterns = [
@@ -19,7 +20,8 @@ urlpatterns = [
     path("api/", include("billing.urls")),
 
     # OpenAPI schema + Swagger/ReDoc UIs
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # Served from the file built by `manage.py build_openapi_schema` when present.
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
     path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
@@ -0,0 +1,105 @@
+"""
+Optional warm-up for cold serverless instances.
+
+Most of a cold start is work Django defers to the first request: importing
+every view module through the URLconf, compiling each URL pattern's regex,
+importing DRF's renderer/parser/authentication classes from their dotted
+paths, loading translation catalogs, and building serializer fields (which
+fills the model `_meta` caches). `warm_up()` does that work once, at
+import time, so the first real request only pays for its own queries.
+
+Enabled from `wsgi.py` with `DJANGO_WARMUP=1`. It never touches the database,
+so it's safe to run before the first request. Any failure is logged and
+ignored: a broken warm-up must not stop the instance from serving.
+"""
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Paths resolved during warm-up: the catalog endpoints a cold instance is
+# most likely to be woken up by.
+WARM_PATHS = ("/api/products/", "/api/orders/")
+
+
+def _urls():
+    from django.urls import Resolver404, get_resolver
+
+    resolver = get_resolver()
+    # Populating the reverse dict walks every (nested) pattern and compiles
+    # its regex.
+    resolver.reverse_dict
+    for path in WARM_PATHS:
+        try:
+            resolver.resolve(path)
+        except Resolver404:
+            pass
+
+
+def _drf():
+    from rest_framework.settings import api_settings
+
+    for name in (
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PERMISSION_CLASSES",
+        "DEFAULT_THROTTLE_CLASSES",
+        "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+        "DEFAULT_METADATA_CLASS",
+        "DEFAULT_VERSIONING_CLASS",
+        "DEFAULT_PAGINATION_CLASS",
+        "DEFAULT_FILTER_BACKENDS",
+        "EXCEPTION_HANDLER",
+    ):
+        getattr(api_settings, name)
+
+
+def _translations():
+    from django.utils import translation
+
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("Not found.")
+
+
+def _serializers():
+    from orders.serializers import OrderSerializer
+    from products.serializers import ProductSerializer
+
+    for serializer_class in (ProductSerializer, OrderSerializer):
+        serializer_class().fields
+
+
+def _storage():
+    from django.core.files.storage import default_storage
+
+    default_storage._setup()
+
+
+STEPS = (
+    ("urls", _urls),
+    ("drf", _drf),
+    ("translations", _translations),
+    ("serializers", _serializers),
+    ("storage", _storage),
+)
+
+
+def warm_up():
+    """Run every warm-up step; returns `{step: seconds}`."""
+    timings = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %r failed", name)
+        timings[name] = time.perf_counter() - started
+    logger.info(
+        "Warm-up done in %.1f ms (%s)",
+        1000 * sum(timings.values()),
+        ", ".join(f"{k}={1000 * v:.1f}ms" for k, v in timings.items()),
+    )
+    return timings
@@ -14,4 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'FPSDayalbaghBackend.settings')
 
 application = get_wsgi_application()
+
+# Opt-in: do the URL/DRF/serializer set-up the first request would otherwise
+# pay for while the instance initialises (see FPSDayalbaghBackend.warmup).
+if os.environ.get('DJANGO_WARMUP', '').lower() in ('1', 'true', 'yes'):
+    from FPSDayalbaghBackend.warmup import warm_up
+    warm_up()
+
 app = application
@@ -0,0 +1,152 @@
+# billing/invoicing.py
+"""
+Invoice generation for online orders.
+
+`billing.signals` used to build the invoice inside `Order.save()`'s post_save,
+so every admin status change paid for an items lookup per line, a recalc, a
+payment insert and a refresh while the order's transaction was still open.
+The receiver now only schedules `invoice_order(order_id)` with
+`transaction.on_commit`; the work below runs after the status change has
+committed, in a fixed number of queries regardless of how many lines the
+order has.
+
+There is no task queue in this deployment, so "after commit" still means
+inside the same request: the admin's response waits for it, but the order
+row is no longer locked meanwhile and an invoicing failure can't undo the
+status change (it is logged; `manage.py backfill_order_invoices` repairs
+it). The status-changing views wrap their save in `transaction.atomic()`;
+a bare `Order.save()` in autocommit runs the callback straight away.
+"""
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+
+from orders.models import Order, OrderItem
+from .models import BillingInvoice, BillingItem, BillingPayment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONLINE_METHOD = getattr(settings, "BILLING_ONLINE_METHOD", "online")
+
+
+def _order_lines(order_id):
+    """(product_id, name, qty, unit_price) per order line, in one joined query."""
+    return list(
+        OrderItem.objects
+        .filter(order_id=order_id)
+        .order_by("id")
+        .values_list("product_id", "product__name", "quantity", "unit_price")
+    )
+
+
+def _billing_items(inv, lines):
+    return [
+        BillingItem(
+            invoice=inv,
+            product_id=pid,
+            name=name or "",
+            qty=Decimal(qty),
+            unit_price=Decimal(unit_price),
+        )
+        for pid, name, qty, unit_price in lines
+    ]
+
+
+@transaction.atomic
+def invoice_order(order_id, txn_id=""):
+    """
+    Create (or complete) the online invoice for an order and capture whatever
+    is still due. Idempotent: an existing invoice is reused, lines are only
+    copied when it has none, and nothing is captured once it's fully paid.
+    Returns the invoice, or None if the order no longer exists.
+    """
+    # Row lock serialises concurrent transitions of the same order so they
+    # can't both create an invoice.
+    order = (
+        Order.objects.select_for_update()
+        .filter(pk=order_id)
+        .only("id", "user_id", "shipping_name", "shipping_phone", "total_amount")
+        .first()
+    )
+    if order is None:
+        return None
+
+    inv = BillingInvoice.objects.filter(order_id=order_id).order_by("id").first()
+
+    if inv is None:
+        lines = _order_lines(order_id)
+        subtotal = sum((Decimal(q) * Decimal(p) for _, _, q, p in lines), Decimal("0"))
+        if subtotal == 0:
+            # No lines or zero total: sync from the order as a safety net.
+            subtotal = Decimal(order.total_amount or 0)
+        subtotal = subtotal.quantize(Decimal("0.01"))
+        total = max(subtotal, Decimal("0"))
+
+        # Insert the invoice already settled; the payment below is written with
+        # bulk_create so BillingPayment.save() doesn't apply it a second time.
+        inv = BillingInvoice.objects.create(
+            mode=BillingInvoice.MODE_ONLINE,
+            status=BillingInvoice.STATUS_PAID if total > 0 else BillingInvoice.STATUS_OPEN,
+            order_id=order.id,
+            customer_id=order.user_id,
+            # Store shipping snapshot even if user exists
+            customer_name=order.shipping_name or "",
+            customer_phone=order.shipping_phone or "",
+            subtotal=subtotal,
+            discount=Decimal("0"),
+            total=total,
+            paid_amount=total,
+        )
+        if lines:
+            BillingItem.objects.bulk_create(_billing_items(inv, lines))
+        if total > 0:
+            BillingPayment.objects.bulk_create([BillingPayment(
+                invoice=inv,
+                method=DEFAULT_ONLINE_METHOD,
+                amount=total,
+                status="captured",
+                txn_id=str(txn_id or "")[:120],
+                received_by=None,
+            )])
+        return inv
+
+    # Existing invoice (e.g. created by an earlier transition): fill in lines
+    # if it has none, recompute, then capture the remaining due.
+    if not inv.items.exists():
+        lines = _order_lines(order_id)
+        if lines:
+            BillingItem.objects.bulk_create(_billing_items(inv, lines))
+
+    inv.recalc(save=True)
+    if inv.total == 0 and order.total_amount not in (None, ""):
+        inv.subtotal = Decimal(order.total_amount or 0)
+        inv.total = max(inv.subtotal - (inv.discount or 0), Decimal("0"))
+        inv.save(update_fields=["subtotal", "total"])
+
+    due = (inv.total or Decimal("0")) - (inv.paid_amount or Decimal("0"))
+    if due > 0:
+        # BillingPayment.save() applies the amount with an atomic F() update
+        # and updates this in-memory invoice.
+        BillingPayment.objects.create(
+            invoice=inv,
+            method=DEFAULT_ONLINE_METHOD,
+            amount=due,
+            status="captured",
+            txn_id=str(txn_id or "")[:120],
+            received_by=None,
+        )
+    return inv
+
+
+def invoice_order_safely(order_id, txn_id=""):
+    """on_commit entry point: never let an invoicing failure surface as a 500
+    for a status change that has already been committed."""
+    try:
+        invoice_order(order_id, txn_id)
+    except Exception:
+        logger.exception(
+            "Invoicing failed for order %s; repair with `manage.py backfill_order_invoices`.",
+            order_id,
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from billing.invoicing import invoice_order
+from billing.signals import BILLING_TRIGGER_STATUSES
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Create invoices for orders already in a billing trigger status that "
+        "have none (e.g. if a deferred invoicing step failed after commit)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="List orders without invoicing them.")
+
+    def handle(self, *args, **opts):
+        status_q = Q(pk__in=[])
+        for s in BILLING_TRIGGER_STATUSES:
+            status_q |= Q(status__iexact=s)
+
+        ids = list(
+            Order.objects.filter(status_q, invoices__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if opts["dry_run"]:
+            self.stdout.write(f"Would invoice {len(ids)} order(s): {ids}")
+            return
+
+        done = 0
+        for order_id in ids:
+            if invoice_order(order_id) is not None:
+                done += 1
+        self.stdout.write(self.style.SUCCESS(f"Invoiced {done} order(s)."))
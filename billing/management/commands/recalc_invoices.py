@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from billing.models import BillingInvoice
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute subtotal/total from invoice lines in a single UPDATE. "
+        "Use to repair invoices whose stored totals drifted from their items."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Invoice ids (default: all).")
+        parser.add_argument("--since", help="Only invoices created on/after YYYY-MM-DD.")
+        parser.add_argument(
+            "--include-void", action="store_true", help="Also recompute void invoices."
+        )
+
+    def handle(self, *args, **opts):
+        qs = BillingInvoice.objects.all()
+        if opts["ids"]:
+            qs = qs.filter(pk__in=opts["ids"])
+        if opts["since"]:
+            d = parse_date(opts["since"])
+            if d:
+                qs = qs.filter(created_at__date__gte=d)
+        if not opts["include_void"]:
+            qs = qs.exclude(status=BillingInvoice.STATUS_VOID)
+
+        updated = qs.recalc()
+        self.stdout.write(self.style.SUCCESS(f"Recalculated {updated} invoice(s)."))
@@ -1,7 +1,42 @@
 from decimal import Decimal
 from django.db import models
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
 
+
+def _money(expr):
+    return models.ExpressionWrapper(expr, output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+# Sum of qty * unit_price over an invoice's lines, computed by the database.
+LINE_TOTAL_SUM = Sum(_money(F("qty") * F("unit_price")))
+
+
+class BillingInvoiceQuerySet(models.QuerySet):
+    def recalc(self):
+        """
+        Recompute subtotal/total for every invoice in the queryset with a single
+        UPDATE (correlated subquery over BillingItem). Mirrors
+        BillingInvoice.recalc: total = max(subtotal - discount, 0). Returns the
+        number of invoices updated. Use for batch repair and bulk paths.
+        """
+        zero = Value(Decimal("0"), output_field=DecimalField(max_digits=12, decimal_places=2))
+        lines = (
+            BillingItem.objects
+            .filter(invoice=OuterRef("pk"))
+            .order_by()
+            .values("invoice")
+            .annotate(s=LINE_TOTAL_SUM)
+            .values("s")
+        )
+        sub = Coalesce(Subquery(lines), zero)
+        return self.update(
+            subtotal=sub,
+            total=Greatest(_money(sub - Coalesce(F("discount"), zero)), zero),
+        )
+
+
 class BillingInvoice(models.Model):
     MODE_ONLINE = "online"
     MODE_MANUAL = "manual"
@@ -47,10 +82,10 @@ class BillingInvoice(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BillingInvoiceQuerySet.as_manager()
+
     def recalc(self, save=True):
-        sub = Decimal("0")
-        for it in self.items.all():
-            sub += (it.qty * it.unit_price)
+        sub = self.items.aggregate(s=LINE_TOTAL_SUM)["s"] or Decimal("0")
         self.subtotal = sub
         tot = sub - (self.discount or 0)
         if tot < 0:
@@ -79,6 +114,53 @@ class BillingItem(models.Model):
         return self.qty * self.unit_price
 
 
+def apply_captured_amounts(amounts, chunk_size=500):
+    """
+    Atomically add captured payment amounts to their invoices.
+
+    `amounts` maps invoice_id -> Decimal. Each chunk is ONE UPDATE that bumps
+    `paid_amount` with an F() expression and flips `status` to paid/open in the
+    same statement, so two tills paying the same invoice can never lose an
+    update and no read round-trip is needed.
+    """
+    money = DecimalField(max_digits=12, decimal_places=2)
+    items = [(pk, Decimal(a)) for pk, a in amounts.items() if a]
+    for i in range(0, len(items), chunk_size):
+        chunk = items[i:i + chunk_size]
+        if len(chunk) == 1:
+            add = Value(chunk[0][1], output_field=money)
+        else:
+            add = Case(
+                *[When(pk=pk, then=Value(a, output_field=money)) for pk, a in chunk],
+                output_field=money,
+            )
+        # The CASE sees pre-update column values, so compare old paid + add.
+        BillingInvoice.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+            paid_amount=F("paid_amount") + add,
+            status=Case(
+                When(paid_amount__gte=F("total") - add, then=Value(BillingInvoice.STATUS_PAID)),
+                default=Value(BillingInvoice.STATUS_OPEN),
+            ),
+        )
+
+
+class BillingPaymentManager(models.Manager):
+    def capture_many(self, payments):
+        """
+        Insert many captured payments at once (e.g. day-end settlement) and
+        apply them to their invoices with one UPDATE per chunk rather than one
+        read-modify-write per payment. `payments` are unsaved BillingPayment
+        instances; non-"captured" ones are stored but not applied.
+        """
+        created = self.bulk_create(payments)
+        totals = {}
+        for p in created:
+            if p.status == "captured":
+                totals[p.invoice_id] = totals.get(p.invoice_id, Decimal("0")) + Decimal(p.amount)
+        apply_captured_amounts(totals)
+        return created
+
+
 class BillingPayment(models.Model):
     METHOD_CHOICES = (
         ("online", "Online Gateway"),
@@ -103,11 +185,17 @@ class BillingPayment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BillingPaymentManager()
+
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         super().save(*args, **kwargs)
         if is_new and self.status == "captured":
-            inv = self.invoice
-            inv.paid_amount = (inv.paid_amount or 0) + self.amount
-            inv.status = BillingInvoice.STATUS_PAID if inv.paid_amount >= inv.total else BillingInvoice.STATUS_OPEN
-            inv.save(update_fields=["paid_amount", "status"])
+            apply_captured_amounts({self.invoice_id: self.amount})
+            # Keep an already-loaded invoice roughly in sync without another
+            # query; callers that need the authoritative value (a concurrent
+            # till may have paid too) should refresh_from_db().
+            if BillingPayment.invoice.is_cached(self):
+                inv = self.invoice
+                inv.paid_amount = (inv.paid_amount or 0) + self.amount
+                inv.status = BillingInvoice.STATUS_PAID if inv.paid_amount >= inv.total else BillingInvoice.STATUS_OPEN
@@ -1,5 +1,7 @@
 # billing/serializers.py
 from decimal import Decimal
+from functools import partial
+
 from django.db import transaction
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -7,8 +9,9 @@ from rest_framework import serializers
 
 from .models import BillingInvoice, BillingItem, BillingPayment
 from orders.models import Order, OrderItem, OrderStatus,OrderSource
+from orders.signals import notify_status_change
 from products.models import Product
-from products.inventory import apply_delta, InsufficientStock, Reason
+from products.inventory import apply_deltas, InsufficientStock, Reason
 
 
 class POSItemSerializer(serializers.Serializer):
@@ -83,6 +86,18 @@ class POSCreateSerializer(serializers.Serializer):
 
     @transaction.atomic
     def create(self, validated_data):
+        """
+        POS checkout in a constant number of queries, regardless of cart size:
+        lock products once, validate and price the cart in memory, then insert
+        the order, its lines, the stock ledger, the invoice (with final totals
+        and paid state) and its lines with one statement each.
+
+        A settled bill inserts its order already in its final status, so no
+        PENDING -> PAID save happens. That transition used to notify the
+        order's owner, which is now done explicitly after commit. It also
+        made billing.signals build a second, ONLINE invoice next to this
+        one, which is intentionally gone.
+        """
         request = self.context.get("request")
         cashier = request.user  # The staff user creating the POS bill
 
@@ -105,28 +120,14 @@ class POSCreateSerializer(serializers.Serializer):
 
         addr = self._fill_address_defaults(validated_data)
 
-        # ---- Create ORDER + ITEMS (owned by CASHIER for audit) ----
-        order = Order.objects.create(
-            user=cashier,
-            status=OrderStatus.PENDING,
-            source=OrderSource.POS,
-            payment_method=pm_order,
-            shipping_name=addr["shipping_name"],
-            shipping_phone=addr["shipping_phone"],
-            address_line1=addr["address_line1"],
-            address_line2=addr["address_line2"],
-            city=addr["city"],
-            state=addr["state"],
-            pincode=addr["pincode"],
-        )
-
         # Lock & map products
         product_ids = [int(i["product_id"]) for i in items]
         products = Product.objects.select_for_update().filter(id__in=product_ids)
         pmap = {p.id: p for p in products}
 
+        # ---- Validate & price the cart in memory ----
+        lines = []
         total = Decimal("0")
-        oi_rows = []
         for it in items:
             pid = int(it["product_id"])
             qty = Decimal(it["qty"])
@@ -138,73 +139,101 @@ class POSCreateSerializer(serializers.Serializer):
             if qty <= 0:
                 raise serializers.ValidationError({"items": "Quantity must be >= 1."})
 
-            # Locked above via select_for_update; apply_delta guards against
-            # oversell and records the audit movement.
-            try:
-                apply_delta(p, -int(qty), reason=Reason.SALE, user=cashier,
-                            reference=f"order:{order.id}")
-            except InsufficientStock:
-                raise serializers.ValidationError(
-                    {"items": f"Insufficient stock for {p.name}."}
-                )
-
             line_total = qty * unit_price
             total += line_total
+            lines.append((p, qty, unit_price, line_total, it.get("name", "") or p.name))
+
+        # Invoice totals mirror BillingInvoice.recalc / BillingPayment.save.
+        total = total.quantize(Decimal("0.01"))
+        inv_total = max(total - discount, Decimal("0"))
+        if paid_flag and (not paid_amount or paid_amount <= 0):
+            paid_amount = inv_total
+        inv_paid = paid_amount > 0 and paid_amount >= inv_total
+
+        # ---- Create ORDER (owned by CASHIER for audit) with its final total ----
+        # keep gross in order.total_amount (matches online flow)
+        order = Order.objects.create(
+            user=cashier,
+            status=(
+                OrderStatus.PAID
+                if paid_flag or paid_amount >= inv_total
+                else OrderStatus.PENDING
+            ),
+            source=OrderSource.POS,
+            payment_method=pm_order,
+            total_amount=total,
+            shipping_name=addr["shipping_name"],
+            shipping_phone=addr["shipping_phone"],
+            address_line1=addr["address_line1"],
+            address_line2=addr["address_line2"],
+            city=addr["city"],
+            state=addr["state"],
+            pincode=addr["pincode"],
+        )
+        if order.status != OrderStatus.PENDING:
+            transaction.on_commit(partial(notify_status_change, order))
+
+        # Locked above via select_for_update; apply_deltas guards against
+        # oversell and records one audit movement per line.
+        try:
+            apply_deltas(
+                [(p, -int(qty)) for p, qty, *_ in lines],
+                reason=Reason.SALE, user=cashier, reference=f"order:{order.id}",
+            )
+        except InsufficientStock as e:
+            raise serializers.ValidationError(
+                {"items": f"Insufficient stock for {e.product.name}."}
+            )
 
-            oi_rows.append(OrderItem(
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
                 product=p,
                 quantity=int(qty),
                 unit_price=unit_price,
                 line_total=line_total,
-            ))
-
-        OrderItem.objects.bulk_create(oi_rows)
-
-        # keep gross in order.total_amount (matches online flow)
-        order.total_amount = total
-        if paid_flag or paid_amount >= max(total - discount, Decimal("0")):
-            order.status = OrderStatus.PAID
-        order.save(update_fields=["total_amount", "status"])
+            )
+            for p, qty, unit_price, line_total, _ in lines
+        ])
 
-        # ---- Create INVOICE linked to ORDER ----
+        # ---- Create INVOICE linked to ORDER, already totalled and settled ----
         inv = BillingInvoice.objects.create(
             mode=BillingInvoice.MODE_MANUAL,
-            status=BillingInvoice.STATUS_OPEN,
+            status=BillingInvoice.STATUS_PAID if inv_paid else BillingInvoice.STATUS_OPEN,
             order=order,
             customer=invoice_customer,  # optional linkage to a real customer
             cashier=cashier,            # who billed
+            subtotal=total,
             discount=discount,
+            total=inv_total,
+            paid_amount=paid_amount if paid_amount > 0 else Decimal("0"),
             customer_name=(validated_data.get("customer_name") or addr["shipping_name"]),
             customer_phone=(validated_data.get("customer_phone") or addr["shipping_phone"]),
         )
 
         # Mirror items to invoice lines
-        for it in items:
-            pid = int(it["product_id"])
-            name = it.get("name", "") or pmap[pid].name
-            BillingItem.objects.create(
+        BillingItem.objects.bulk_create([
+            BillingItem(
                 invoice=inv,
-                product_id=pid,
+                product_id=p.id,
                 name=name,
-                qty=it["qty"],
-                unit_price=it["unit_price"],
+                qty=qty,
+                unit_price=unit_price,
             )
-
-        inv.recalc(save=True)
-
-        # Auto-capture payment if indicated
-        if paid_flag and (not paid_amount or paid_amount <= 0):
-            paid_amount = inv.total
-
-        if paid_amount and paid_amount > 0:
-            BillingPayment.objects.create(
+            for p, qty, unit_price, _, name in lines
+        ])
+
+        # Record the payment. bulk_create skips BillingPayment.save(), which
+        # would otherwise add the amount to the invoice a second time — the
+        # invoice above was inserted with paid_amount/status already applied.
+        if paid_amount > 0:
+            BillingPayment.objects.bulk_create([BillingPayment(
                 invoice=inv,
                 method=pm_billing,  # "cash"/"upi"/"card"/"online"/"cod"
                 amount=paid_amount,
                 status="captured",
                 received_by=cashier,
-            )
+            )])
 
         return inv
 
@@ -232,3 +261,78 @@ class InvoicePaySerializer(serializers.Serializer):
             status="captured",
             received_by=request.user if request else None,
         )
+
+
+class InvoiceBulkPayItemSerializer(serializers.Serializer):
+    invoice_id = serializers.IntegerField()
+    payment_method = serializers.CharField()
+    # Omit to settle whatever is still due on the invoice.
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, min_value=Decimal("0.01"))
+    txn_id = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_payment_method(self, value):
+        v = (value or "").lower()
+        valid = [c[0] for c in BillingPayment.METHOD_CHOICES]
+        if v not in valid:
+            raise serializers.ValidationError(f"Unsupported method. Use one of {valid}.")
+        return v
+
+
+class InvoiceBulkPaySerializer(serializers.Serializer):
+    """
+    Day-end settlement: record payments against many invoices in one request.
+    Payments are inserted with one statement and applied to invoices with
+    atomic F() updates (see BillingPaymentManager.capture_many).
+    """
+    payments = InvoiceBulkPayItemSerializer(many=True)
+
+    def validate(self, data):
+        if not data.get("payments"):
+            raise serializers.ValidationError({"payments": "At least one payment is required."})
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        request = self.context.get("request")
+        rows = validated_data["payments"]
+
+        ids = {r["invoice_id"] for r in rows}
+        invoices = {
+            inv.id: inv
+            for inv in BillingInvoice.objects.select_for_update().filter(pk__in=ids)
+        }
+        missing = sorted(ids - set(invoices))
+        if missing:
+            raise serializers.ValidationError({"payments": f"Invoices not found: {missing}."})
+
+        # Track what is still due per invoice so several "settle" rows for the
+        # same invoice in one request don't double-pay it.
+        due = {
+            pk: max((inv.total or Decimal("0")) - (inv.paid_amount or Decimal("0")), Decimal("0"))
+            for pk, inv in invoices.items()
+        }
+
+        payments, skipped = [], []
+        for r in rows:
+            inv = invoices[r["invoice_id"]]
+            if inv.status == BillingInvoice.STATUS_VOID:
+                skipped.append({"invoice_id": inv.id, "reason": "void"})
+                continue
+            amount = r.get("amount")
+            if amount is None:
+                amount = due[inv.id]
+            if amount <= 0:
+                skipped.append({"invoice_id": inv.id, "reason": "nothing due"})
+                continue
+            due[inv.id] = max(due[inv.id] - amount, Decimal("0"))
+            payments.append(BillingPayment(
+                invoice=inv,
+                method=r["payment_method"],
+                amount=amount,
+                txn_id=r.get("txn_id", ""),
+                status="captured",
+                received_by=request.user if request else None,
+            ))
+
+        created = BillingPayment.objects.capture_many(payments)
+        return {"payments": created, "skipped": skipped}
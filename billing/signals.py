@@ -98,13 +98,15 @@
 
 
 # billing/signals.py
-from decimal import Decimal
+from functools import partial
+
 from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 
 from orders.models import Order  # uses your Orders app model
-from .models import BillingInvoice, BillingItem, BillingPayment
+from .invoicing import invoice_order_safely
 
 # --- Configurable trigger/status/method mapping ---
 # By default, we auto-bill when an Order turns "PAID".
@@ -114,7 +116,6 @@ from .models import BillingInvoice, BillingItem, BillingPayment
 BILLING_TRIGGER_STATUSES = set(
     s.lower() for s in getattr(settings, "BILLING_TRIGGER_STATUSES", {"PAID"})
 )
-DEFAULT_ONLINE_METHOD = getattr(settings, "BILLING_ONLINE_METHOD", "online")
 
 # --- Track old status for reliable change detection ---
 @receiver(pre_save, sender=Order)
@@ -137,8 +138,9 @@ def _billing_track_old_status(sender, instance: Order, **kwargs):
 def _billing_invoice_on_paid(sender, instance: Order, created, **kwargs):
     """
     When an existing Order's status changes into a trigger (e.g., PAID),
-    create (or reuse) a BillingInvoice, copy items, recalc totals,
-    and capture remaining due as a payment.
+    schedule invoicing (create/reuse invoice, copy items, capture the due)
+    to run once the status change has committed, in the same request. See
+    billing.invoicing.
     """
     if created:
         return
@@ -150,57 +152,11 @@ def _billing_invoice_on_paid(sender, instance: Order, created, **kwargs):
     if not new_status or new_status == old_status or new_status not in BILLING_TRIGGER_STATUSES:
         return
 
-    # Find or create invoice for this order (idempotency)
-    inv = BillingInvoice.objects.filter(order=instance).order_by("id").first()
-
-    if not inv:
-        inv = BillingInvoice.objects.create(
-            mode=BillingInvoice.MODE_ONLINE,
-            status=BillingInvoice.STATUS_OPEN,
-            order=instance,
-            customer=getattr(instance, "user", None),
-            # Store shipping snapshot even if user exists
-            customer_name=getattr(instance, "shipping_name", "") or "",
-            customer_phone=getattr(instance, "shipping_phone", "") or "",
-            discount=Decimal("0"),
-        )
-
-    # If invoice has no items yet, copy order items into invoice (idempotent)
-    if not inv.items.exists():
-        # Use the snapshot from OrderItem (unit_price, quantity, etc.)
-        order_items = getattr(instance, "items", None)
-        if order_items is not None:
-            rows = []
-            for oi in order_items.all():
-                rows.append(BillingItem(
-                    invoice=inv,
-                    product_id=getattr(oi.product, "id", None),
-                    name=getattr(oi.product, "name", "") or "",
-                    qty=Decimal(oi.quantity),
-                    unit_price=Decimal(oi.unit_price),
-                ))
-            if rows:
-                BillingItem.objects.bulk_create(rows)
-
-    # Recalculate totals from invoice lines; fall back to order.total_amount if no lines
-    inv.recalc(save=True)
-    if inv.total == 0 and getattr(instance, "total_amount", None) not in (None, ""):
-        # In case no lines or zero total, sync total from order as a safety net
-        inv.subtotal = Decimal(getattr(instance, "total_amount", 0) or 0)
-        inv.total = inv.subtotal - (inv.discount or 0)
-        if inv.total < 0:
-            inv.total = Decimal("0")
-        inv.save(update_fields=["subtotal", "total"])
-
-    # Capture any remaining due as a payment (idempotent: due<=0 means no duplicate)
-    due = (inv.total or Decimal("0")) - (inv.paid_amount or Decimal("0"))
-    if due > 0:
-        BillingPayment.objects.create(
-            invoice=inv,
-            method=DEFAULT_ONLINE_METHOD,          # "online" by default
-            amount=due,
-            status="captured",
-            txn_id=str(getattr(instance, "payment_id", ""))[:120],  # ok if your Order lacks payment_id
-            received_by=None,
-        )
-        inv.refresh_from_db()  # BillingPayment.save() updates paid_amount & status
+    # Runs once the caller's transaction commits (still within the request;
+    # see billing.invoicing), so the order's lock isn't held during invoice
+    # writes and a rolled-back status change never invoices.
+    transaction.on_commit(partial(
+        invoice_order_safely,
+        instance.pk,
+        str(getattr(instance, "payment_id", "")),  # ok if your Order lacks payment_id
+    ))
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import POSCreateInvoiceView, InvoicePayView
+from .views import POSCreateInvoiceView, InvoicePayView, InvoiceBulkPayView
 
 urlpatterns = [
     path("pos/invoices/", POSCreateInvoiceView.as_view(), name="billing-pos-create"),
     path("invoices/<int:pk>/pay/", InvoicePayView.as_view(), name="billing-invoice-pay"),
+    path("invoices/pay-bulk/", InvoiceBulkPayView.as_view(), name="billing-invoice-pay-bulk"),
 ]
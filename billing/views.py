@@ -5,7 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
 from .models import BillingInvoice
-from .serializers import POSCreateSerializer, InvoicePaySerializer
+from .serializers import POSCreateSerializer, InvoicePaySerializer, InvoiceBulkPaySerializer
 
 
 class IsShopkeeper(IsAuthenticated):
@@ -66,3 +66,40 @@ class InvoicePayView(APIView):
             "customer_id": inv.customer_id,
             "cashier_id": inv.cashier_id,
         })
+
+
+class InvoiceBulkPayView(APIView):
+    """
+    POST body:
+    {
+      "payments": [
+        {"invoice_id": 1, "payment_method": "cash", "amount": 120.00},
+        {"invoice_id": 2, "payment_method": "upi"}          # settles remaining due
+      ]
+    }
+    """
+    permission_classes = [IsShopkeeper]
+
+    def post(self, request):
+        ser = InvoiceBulkPaySerializer(data=request.data, context={"request": request})
+        ser.is_valid(raise_exception=True)
+        result = ser.save()
+
+        ids = {p.invoice_id for p in result["payments"]}
+        invoices = BillingInvoice.objects.filter(pk__in=ids).only("id", "order_id", "status", "paid_amount", "total")
+
+        return Response({
+            "ok": True,
+            "payments": len(result["payments"]),
+            "skipped": result["skipped"],
+            "invoices": [
+                {
+                    "invoice_id": inv.id,
+                    "order_id": inv.order_id,
+                    "status": inv.status,
+                    "total": str(inv.total),
+                    "paid_amount": str(inv.paid_amount),
+                }
+                for inv in invoices
+            ],
+        })
@@ -1,3 +1,4 @@
 # build_files.sh
 pip install -r requirements.txt
+python3.12 manage.py build_openapi_schema --check
 python3.12 manage.py collectstatic --noinput --clear
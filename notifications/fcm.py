@@ -83,8 +83,10 @@ from pathlib import Path
 from typing import Iterable, Mapping
 
 from django.conf import settings
-import firebase_admin
-from firebase_admin import credentials, messaging
+
+# firebase_admin (and the google-auth/requests/cryptography stack under it) is
+# imported on the first push, not at startup: orders.signals imports this
+# module, so a top-level import was paid by every cold start.
 
 log = logging.getLogger(__name__)
 
@@ -99,6 +101,9 @@ def _init():
     3) GOOGLE_APPLICATION_CREDENTIALS (file path in env)
     4) options-only init (projectId from env/settings), as a last resort
     """
+    import firebase_admin
+    from firebase_admin import credentials
+
     if firebase_admin._apps:
         return firebase_admin.get_app()
 
@@ -149,6 +154,8 @@ def _init():
 
 
 def _send_one(token: str, title: str, body: str, data: Mapping[str, str] | None, app):
+    from firebase_admin import messaging
+
     msg = messaging.Message(
         token=token,
         notification=messaging.Notification(title=title, body=body),
@@ -171,12 +178,12 @@ def send_to_tokens(
     body: str,
     data: Mapping[str, str] | None = None,
 ):
-    app = _init()
-
     clean_tokens = [t for t in tokens if t]
     if not clean_tokens:
         return {"success": 0, "failure": 0, "errors": [], "removed": 0}
 
+    app = _init()
+
     success = 0
     errors = []
     removed = 0
@@ -3,11 +3,23 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-try:
-    import firebase_admin
-    from firebase_admin import credentials
 
-    if not firebase_admin._apps:
+def init_firebase():
+    """
+    Initialize the default Firebase Admin app from GOOGLE_APPLICATION_CREDENTIALS
+    or FIREBASE_CREDENTIALS_JSON, once. Returns True if an app is available.
+
+    Used to run at import time, which pulled firebase_admin and its google-auth
+    stack into every cold start; it now runs right before the first push
+    (see notifications.utils.send_fcm_multicast).
+    """
+    try:
+        import firebase_admin
+        from firebase_admin import credentials
+
+        if firebase_admin._apps:
+            return True
+
         cred = None
         # Preferred: GOOGLE_APPLICATION_CREDENTIALS path
         svc_path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
@@ -18,16 +30,14 @@ try:
         if not cred:
             json_str = os.environ.get('FIREBASE_CREDENTIALS_JSON')
             if json_str:
-                import json, tempfile
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.json')
-                tmp.write(json_str.encode('utf-8'))
-                tmp.flush()
-                cred = credentials.Certificate(tmp.name)
+                import json
+                cred = credentials.Certificate(json.loads(json_str))
 
         if cred:
             firebase_admin.initialize_app(cred)
             logger.info("Firebase Admin initialized.")
-        else:
-            logger.warning("Firebase credentials not provided; notifications disabled.")
-except Exception as e:
-    logger.exception("Firebase init failed: %s", e)
+            return True
+        logger.warning("Firebase credentials not provided; notifications disabled.")
+    except Exception as e:
+        logger.exception("Firebase init failed: %s", e)
+    return False
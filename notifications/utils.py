@@ -4,16 +4,16 @@ from typing import Iterable, Dict, Any
 logger = logging.getLogger(__name__)
 
 def send_fcm_multicast(tokens: Iterable[str], title: str, body: str, data: Dict[str, Any] | None = None):
-    try:
-        from firebase_admin import messaging
-    except Exception:
-        logger.warning("Firebase not initialized; skipping push.")
-        return
-
     tokens = [t for t in tokens if t]
     if not tokens:
         return
 
+    from .firebase_init import init_firebase
+    if not init_firebase():
+        logger.warning("Firebase not initialized; skipping push.")
+        return
+    from firebase_admin import messaging
+
     message = messaging.MulticastMessage(
         notification=messaging.Notification(title=title, body=body),
         data={k: str(v) for k, v in (data or {}).items()},
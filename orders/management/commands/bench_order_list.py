@@ -0,0 +1,91 @@
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from orders.models import Order, OrderItem
+from orders.serializers import UserOrderSerializer
+from orders.views import _with_read_projection
+from products.models import Category, Product
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark order-list serialization (query count and time) for the "
+        "legacy queryset vs. the projected one. Fixture data is created inside "
+        "a transaction that is always rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=100)
+        parser.add_argument("--lines", type=int, default=5, help="Lines per order.")
+        parser.add_argument("--products", type=int, default=20, help="Distinct products to spread lines over.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            user = self._fixture(opts["orders"], opts["lines"], opts["products"])
+            request = APIRequestFactory().get("/api/me/orders/")
+
+            variants = [
+                ("legacy", lambda: (
+                    Order.objects.filter(user=user)
+                    .select_related("user")
+                    .prefetch_related("items__product", "invoices")
+                    .order_by("-created_at")
+                )),
+                ("projected", lambda: (
+                    _with_read_projection(Order.objects).filter(user=user).order_by("-created_at")
+                )),
+            ]
+            for label, make_qs in variants:
+                timings, queries = [], 0
+                for _ in range(opts["repeat"]):
+                    with CaptureQueriesContext(connection) as ctx:
+                        t0 = time.perf_counter()
+                        data = UserOrderSerializer(make_qs(), many=True, context={"request": request}).data
+                        timings.append((time.perf_counter() - t0) * 1000)
+                    queries = len(ctx.captured_queries)
+                self.stdout.write(
+                    f"{label:>10}: {len(data)} orders, {queries} queries, "
+                    f"median {statistics.median(timings):.1f} ms, best {min(timings):.1f} ms"
+                )
+
+            transaction.set_rollback(True)
+
+    def _fixture(self, n_orders, n_lines, n_products):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            phone=f"b{tag}", name="Bench", address="-", password=None
+        )
+        cat = Category.objects.create(name=f"bench-{tag}")
+        products = Product.objects.bulk_create([
+            Product(
+                name=f"Bench {i}", price=Decimal("10.00"), stock=1000, category=cat,
+                image=f"products/bench_{tag}_{i}.jpg",
+            )
+            for i in range(n_products)
+        ])
+        orders = Order.objects.bulk_create([
+            Order(
+                user=user, shipping_name="Bench", shipping_phone=f"b{tag}",
+                address_line1="-", city="-", state="-", pincode="0",
+                total_amount=Decimal("10.00") * n_lines,
+            )
+            for _ in range(n_orders)
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=o, product=products[(i + j) % n_products], quantity=1,
+                unit_price=Decimal("10.00"), line_total=Decimal("10.00"),
+            )
+            for i, o in enumerate(orders)
+            for j in range(n_lines)
+        ])
+        return user
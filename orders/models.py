@@ -141,6 +141,14 @@ class Order(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as read, so orders.signals can tell a status change without
+        # re-reading the row (None if `status` was deferred).
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
     def __str__(self):
         return f"Order #{self.id} - {self.user} - {self.status} - {self.source}"
 
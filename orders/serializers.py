@@ -285,6 +285,38 @@ class OrderItemInputSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1)
 
 
+class OrderItemEditSerializer(serializers.Serializer):
+    """One operation of a batch `edit-items` request."""
+    op = serializers.ChoiceField(choices=["add", "update", "remove"])
+    product_id = serializers.IntegerField(required=False)
+    item_id = serializers.IntegerField(required=False)
+    quantity = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op == "add":
+            if "product_id" not in attrs:
+                raise serializers.ValidationError({"product_id": "Required for add."})
+            attrs.setdefault("quantity", 1)
+        else:
+            if "item_id" not in attrs:
+                raise serializers.ValidationError({"item_id": f"Required for {op}."})
+            if op == "update" and "quantity" not in attrs:
+                raise serializers.ValidationError({"quantity": "Required for update."})
+        return attrs
+
+
+class OrderItemsEditSerializer(serializers.Serializer):
+    operations = OrderItemEditSerializer(many=True)
+
+    def validate_operations(self, operations):
+        if not operations:
+            raise serializers.ValidationError("At least one operation is required.")
+        if len(operations) > 100:
+            raise serializers.ValidationError("At most 100 operations per request.")
+        return operations
+
+
 class OrderItemSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source="product.name", read_only=True)
     product_id = serializers.IntegerField(source="product.id", read_only=True)
@@ -299,14 +331,21 @@ class OrderItemSerializer(serializers.ModelSerializer):
         ]
 
     def get_image_url(self, obj):
-        request = self.context.get("request")
+        # Resolved once per distinct image per response (shared root context),
+        # so a 100-order list doesn't call storage.url() for every line.
+        cache = self.context.setdefault("_image_urls", {})
         img = getattr(obj.product, "image", None)
-        try:
-            if img and getattr(img, "url", None):
-                return request.build_absolute_uri(img.url) if request else img.url
-        except Exception:
-            pass
-        return None
+        name = getattr(img, "name", None)
+        if not name:
+            return None
+        if name not in cache:
+            request = self.context.get("request")
+            try:
+                url = img.url
+                cache[name] = request.build_absolute_uri(url) if request else url
+            except Exception:
+                cache[name] = None
+        return cache[name]
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -373,17 +412,18 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         items_data = validated_data.pop("items")
 
-        # ONLINE checkout path – source defaults to ONLINE in the model
-        order = Order.objects.create(user=user, **validated_data)
+        # Lock and price every product before writing anything, so the order
+        # row is inserted once with its final total (one post_save, no
+        # follow-up UPDATE).
+        product_ids = {i["product_id"] for i in items_data}
+        pmap = {p.id: p for p in Product.objects.select_for_update().filter(id__in=product_ids)}
 
+        # Reserve stock. Physical `stock` is only decremented when an admin
+        # confirms the order; until then the order holds a reservation that
+        # reduces what new customers can order. Repeated lines for a product
+        # count against one another.
         total = Decimal("0.00")
-
-        # Lock products
-        product_ids = [i["product_id"] for i in items_data]
-        products = Product.objects.select_for_update().filter(id__in=product_ids)
-        pmap = {p.id: p for p in products}
-
-        # Validate items
+        lines = []
         for item in items_data:
             pid = item["product_id"]
             qty = int(item["quantity"])
@@ -392,40 +432,85 @@ class OrderCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"items": f"Product {pid} not found."})
             if qty <= 0:
                 raise serializers.ValidationError({"items": "Quantity must be >= 1."})
-            if p.available < qty:
+            try:
+                reserve(p, qty, save=False)
+            except InsufficientStock:
                 raise serializers.ValidationError({"items": f"Insufficient stock for {p.name}."})
 
-        # Create items & reserve stock. Physical `stock` is only decremented when
-        # an admin confirms the order; until then the order holds a reservation
-        # that reduces what new customers can order.
-        rows = []
-        for item in items_data:
-            pid = item["product_id"]
-            qty = int(item["quantity"])
-            p = pmap[pid]
             unit_price = Decimal(p.price)
             line_total = unit_price * qty
             total += line_total
+            lines.append((p, qty, unit_price, line_total))
 
-            rows.append(OrderItem(
-                order=order, product=p, quantity=qty,
-                unit_price=unit_price, line_total=line_total
-            ))
-
-            # Locked above via select_for_update; reserve guards against oversell.
-            try:
-                reserve(p, qty)
-            except InsufficientStock:
-                raise serializers.ValidationError(
-                    {"items": f"Insufficient stock for {p.name}."}
-                )
-
-        OrderItem.objects.bulk_create(rows)
+        # Locked above via select_for_update; one UPDATE for all reservations.
+        Product.objects.bulk_update(pmap.values(), ["reserved"])
 
-        order.total_amount = total
-        order.save(update_fields=["total_amount"])
+        # ONLINE checkout path – source defaults to ONLINE in the model
+        order = Order.objects.create(user=user, total_amount=total, **validated_data)
+        rows = OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=p, quantity=qty, unit_price=unit_price, line_total=line_total)
+            for p, qty, unit_price, line_total in lines
+        ])
+        # The response is rendered from these objects rather than re-read.
+        order._prefetched_objects_cache = {"items": rows}
         return order
 
     def to_representation(self, instance):
         # After creation, return the full order representation (generic/admin serializer is fine here)
         return OrderSerializer(instance, context=self.context).data
+
+
+class CartQuoteSerializer(serializers.Serializer):
+    """
+    Prices a cart against the live catalog without creating anything.
+
+    One plain (non-locking) read of the cart's products; each line reports its
+    current unit price, line total and whether enough units are available
+    (`stock - reserved`, counting earlier lines for the same product). A cart
+    that quotes `ok` can still lose a race at checkout, which re-checks under
+    row locks; this just lets clients catch the common failures up front.
+    """
+    items = OrderItemInputSerializer(many=True)
+
+    def validate_items(self, items):
+        if not items:
+            raise serializers.ValidationError("At least one item is required.")
+        return items
+
+    def quote(self):
+        items = self.validated_data["items"]
+        products = {
+            p.id: p
+            for p in Product.objects
+            .filter(id__in={i["product_id"] for i in items})
+            .only("id", "name", "price", "stock", "reserved")
+        }
+
+        lines, requested = [], {}
+        total = Decimal("0.00")
+        for item in items:
+            pid, qty = item["product_id"], item["quantity"]
+            p = products.get(pid)
+            if p is None:
+                lines.append({
+                    "product_id": pid, "product_name": None, "quantity": qty,
+                    "unit_price": None, "line_total": None, "available": 0,
+                    "ok": False, "detail": f"Product {pid} not found.",
+                })
+                continue
+            requested[pid] = requested.get(pid, 0) + qty
+            ok = requested[pid] <= p.available
+            line_total = p.price * qty
+            total += line_total
+            lines.append({
+                "product_id": pid, "product_name": p.name, "quantity": qty,
+                "unit_price": p.price, "line_total": line_total,
+                "available": p.available,
+                "ok": ok, "detail": None if ok else f"Insufficient stock for {p.name}.",
+            })
+
+        return {
+            "items": lines,
+            "total_amount": total,
+            "ok": all(line["ok"] for line in lines),
+        }
@@ -85,8 +85,14 @@ def order_created_notify_admin(sender, instance: Order, created, **kwargs):
 
 # Track old status to detect change
 @receiver(pre_save, sender=Order)
-def order_status_track(sender, instance: Order, **kwargs):
-    if instance.pk:
+def order_status_track(sender, instance: Order, update_fields=None, **kwargs):
+    if update_fields is not None and "status" not in update_fields:
+        # e.g. save(update_fields=["total_amount"]): status can't change, skip the re-fetch
+        instance._old_status = instance.status
+    elif getattr(instance, "_loaded_status", None) is not None:
+        # Loaded from the DB (Order.from_db): no need to read it again
+        instance._old_status = instance._loaded_status
+    elif instance.pk:
         try:
             old = Order.objects.get(pk=instance.pk)
             instance._old_status = old.status
@@ -94,6 +100,17 @@ def order_status_track(sender, instance: Order, **kwargs):
             instance._old_status = None
     else:
         instance._old_status = None
+    # A second save of the same instance compares against this one
+    instance._loaded_status = instance.status
+
+def notify_status_change(order: Order):
+    """Push the order's current status to its owner's devices."""
+    if order.user_id:
+        tokens = _user_tokens(order.user)
+        if tokens:
+            title = f"Order #{order.id} update"
+            body = f"Status changed to {getattr(order, 'status_display', order.status)}"
+            send_to_tokens(tokens, title, body, data={"order_id": str(order.id)})
 
 @receiver(post_save, sender=Order)
 def order_status_changed_notify_user(sender, instance: Order, created, **kwargs):
@@ -103,9 +120,4 @@ def order_status_changed_notify_user(sender, instance: Order, created, **kwargs)
     if old_status is None or old_status == instance.status:
         return
     # (You can keep/adjust this for POS if you want; leaving as-is)
-    if instance.user_id:
-        tokens = _user_tokens(instance.user)
-        if tokens:
-            title = f"Order #{instance.id} update"
-            body = f"Status changed to {getattr(instance, 'status_display', instance.status)}"
-            send_to_tokens(tokens, title, body, data={"order_id": str(instance.id)})
+    notify_status_change(instance)
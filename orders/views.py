@@ -426,18 +426,75 @@
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django.db import transaction, IntegrityError
 from django.utils.dateparse import parse_datetime, parse_date
 
 from .models import Order, OrderItem, OrderStatus, OrderSource
-from .serializers import OrderSerializer, OrderCreateSerializer, UserOrderSerializer
+from .serializers import (
+    OrderSerializer, OrderCreateSerializer, UserOrderSerializer, CartQuoteSerializer,
+    OrderItemsEditSerializer,
+)
 from products.models import Product
 from products.inventory import (
-    apply_delta, reserve, release, commit_reservation, InsufficientStock, Reason,
+    apply_delta, apply_deltas, reserve, release, commit_reservation, InsufficientStock, Reason,
 )
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Q, Prefetch
+
+
+# --- Read projection --------------------------------------------------------
+#
+# Order responses only need the order row, the customer's phone and, per line,
+# the product's name and image. Load exactly that: the joined user row is cut
+# down to `phone`, lines come with their product in one prefetch query, and
+# nothing else (e.g. invoices, which no order serializer renders) is fetched.
+
+ORDER_FIELDS = [f.name for f in Order._meta.concrete_fields]
+
+
+def _with_read_projection(qs):
+    return (
+        qs
+        .select_related("user")
+        .only(*ORDER_FIELDS, "user__phone")
+        .prefetch_related(Prefetch(
+            "items",
+            queryset=(
+                OrderItem.objects
+                .select_related("product")
+                .only(
+                    "id", "order", "quantity", "unit_price", "line_total",
+                    "product", "product__name", "product__image",
+                )
+            ),
+        ))
+    )
+
+
+# Mutating actions lock the order row (select_for_update, so they call
+# `get_object()` inside their transaction) and load only what they need:
+#
+# * ORDER_ROW_ACTIONS change the order row but not its lines, so they lock
+#   the row together with the read projection and render the response from it.
+# * LINE_EDIT_ACTIONS rewrite lines, so they lock the bare row and read the
+#   projection once, afterwards, for the response (`_order_response`).
+
+ORDER_ROW_ACTIONS = {"status", "cancel", "confirm_order", "update_amount"}
+LINE_EDIT_ACTIONS = {"add_item", "remove_item", "update_item_quantity", "edit_items"}
+
+
+def _locked_queryset(action):
+    if action in LINE_EDIT_ACTIONS:
+        return Order.objects.select_for_update()
+    # of=("self",): don't also lock the joined user row.
+    return _with_read_projection(Order.objects).select_for_update(of=("self",))
+
+
+def _order_response(order, serializer_class, request):
+    order = _with_read_projection(Order.objects).get(pk=order.pk)
+    return Response(serializer_class(order, context={"request": request}).data)
 
 
 # --- Inventory phase helpers (reservation model) --------------------------
@@ -475,7 +532,8 @@ def _transition_order_inventory(order, old_status, new_status, user):
     if old_phase == new_phase:
         return
 
-    items = list(order.items.select_related("product").all())
+    # Uses the lines prefetched by the read projection when the order has them.
+    items = list(order.items.all())
     if not items:
         return
 
@@ -529,6 +587,117 @@ def _adjust_item_inventory(order, product, delta, user):
         apply_delta(product, -delta, reason=reason, user=user, reference=ref)
 
 
+def _adjust_items_inventory(order, changes, user):
+    """
+    Batch form of `_adjust_item_inventory`: `changes` maps each locked product
+    to its net unit change. Reservations are written with one UPDATE; committed
+    orders go through `apply_deltas` (one batch for sales, one for returns).
+    Raises InsufficientStock before anything is written.
+    """
+    changes = {product: delta for product, delta in changes.items() if delta}
+    if not changes:
+        return
+    if order.status == OrderStatus.PENDING:
+        for product, delta in changes.items():
+            if delta > 0:
+                reserve(product, delta, save=False)
+            else:
+                release(product, -delta, save=False)
+        Product.objects.bulk_update(list(changes), ["reserved"])
+        return
+
+    ref = f"order:{order.id}"
+    for product, delta in changes.items():
+        if product.stock < delta:
+            raise InsufficientStock(product, product.stock, delta)
+    returns = [(p, -d) for p, d in changes.items() if d < 0]
+    sales = [(p, -d) for p, d in changes.items() if d > 0]
+    if returns:
+        apply_deltas(returns, reason=Reason.RETURN, user=user, reference=ref)
+    if sales:
+        apply_deltas(sales, reason=Reason.SALE, user=user, reference=ref)
+
+
+def _apply_item_edits(order, operations, user):
+    """
+    Apply a batch of line edits (validated `OrderItemsEditSerializer`
+    operations) to `order`, in order:
+
+    - {"op": "add", "product_id", "quantity"}: adds to the product's line, or
+      creates one at the current price
+    - {"op": "update", "item_id", "quantity"}: sets a line's quantity
+    - {"op": "remove", "item_id"}: deletes a line
+
+    Must be called inside an open transaction. Every product involved is
+    locked with one query, inventory is adjusted once per product for the net
+    change, and lines are written with one statement per kind of change.
+    Raises NotFound for unknown items/products and InsufficientStock when the
+    net increase can't be covered; either way nothing has been written.
+    """
+    items = {item.id: item for item in OrderItem.objects.filter(order=order).order_by("id")}
+    for op in operations:
+        if op["op"] != "add" and op["item_id"] not in items:
+            raise NotFound(f"Item {op['item_id']} not found.")
+
+    pids = {op["product_id"] for op in operations if op["op"] == "add"}
+    pids |= {items[op["item_id"]].product_id for op in operations if op["op"] != "add"}
+    locked = {p.id: p for p in Product.objects.select_for_update().filter(id__in=pids).order_by("id")}
+
+    by_product = {}
+    for item in items.values():
+        by_product.setdefault(item.product_id, item)
+
+    created, changed, removed = [], set(), set()
+    deltas = {}
+    total_delta = 0
+    for op in operations:
+        if op["op"] == "add":
+            product = locked.get(op["product_id"])
+            if product is None:
+                raise NotFound(f"Product {op['product_id']} not found.")
+            item = by_product.get(product.id)
+            if item is None:
+                item = OrderItem(order=order, product=product, quantity=0,
+                                 unit_price=product.price, line_total=0)
+                by_product[product.id] = item
+                created.append(item)
+            new_qty = item.quantity + op["quantity"]
+        else:
+            item = items[op["item_id"]]
+            if item.id in removed:
+                raise NotFound(f"Item {item.id} not found.")
+            new_qty = op["quantity"] if op["op"] == "update" else 0
+
+        deltas[item.product_id] = deltas.get(item.product_id, 0) + new_qty - item.quantity
+        line_total = item.unit_price * new_qty
+        total_delta += line_total - item.line_total
+        item.quantity, item.line_total = new_qty, line_total
+
+        if item.pk is None:
+            continue
+        if new_qty:
+            changed.add(item.id)
+        else:
+            removed.add(item.id)
+            changed.discard(item.id)
+            if by_product.get(item.product_id) is item:
+                del by_product[item.product_id]
+
+    _adjust_items_inventory(
+        order, {locked[pid]: delta for pid, delta in deltas.items()}, user
+    )
+
+    if removed:
+        OrderItem.objects.filter(id__in=removed).delete()
+    if changed:
+        OrderItem.objects.bulk_update([items[i] for i in changed], ["quantity", "line_total"])
+    if created:
+        OrderItem.objects.bulk_create(created)
+    if total_delta:
+        order.total_amount = max(order.total_amount + total_delta, 0)
+        order.save(update_fields=["total_amount"])
+
+
 def _filtered_queryset(request, base_qs):
     """
     Apply ?status=, ?since=, ?source=, ?date_from=, ?date_to= filters.
@@ -577,6 +746,8 @@ class UserOrderViewSet(viewsets.ModelViewSet):
     - GET  /api/me/orders/            -> list (my online + my POS-linked orders)
     - GET  /api/me/orders/{id}/       -> retrieve
     - POST /api/me/orders/{id}/cancel/-> cancel if pending (only my own online order)
+    - POST /api/me/orders/quote/      -> price/stock check for a cart, creates nothing
+    - POST /api/me/orders/{id}/edit-items/ -> several add/update/remove edits at once (pending only)
     """
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ["get", "post", "head", "options"]  # no PUT/PATCH/DELETE
@@ -591,16 +762,22 @@ class UserOrderViewSet(viewsets.ModelViewSet):
             if (phone_match_enabled and user_phone)
             else Q(pk__in=[])
         )
+        visible = (
+            Q(user=u) |             # online orders placed by user
+            Q(invoices__customer=u) # POS orders linked to user via invoice.customer
+            | phone_clause          # optional shipping-phone match
+        )
 
-        qs = (
-            Order.objects
-            .select_related("user")
-            .prefetch_related("items__product", "invoices")  # BillingInvoice(order, related_name="invoices")
-            .filter(
-                Q(user=u) |             # online orders placed by user
-                Q(invoices__customer=u) # POS orders linked to user via invoice.customer
-                | phone_clause          # optional shipping-phone match
+        if self.action in ORDER_ROW_ACTIONS | LINE_EDIT_ACTIONS:
+            # FOR UPDATE can't be combined with DISTINCT, so match the
+            # visible ids in a subquery instead.
+            return _locked_queryset(self.action).filter(
+                pk__in=Order.objects.filter(visible).values("pk")
             )
+
+        qs = (
+            _with_read_projection(Order.objects)
+            .filter(visible)
             .distinct()
             .order_by("-created_at")
         )
@@ -662,21 +839,31 @@ class UserOrderViewSet(viewsets.ModelViewSet):
             headers=self.get_success_headers(serializer.data),
         )
 
+    @action(detail=False, methods=["post"])
+    def quote(self, request):
+        """
+        Quote a cart at current prices and stock, without locking or creating anything.
+        Body: {"items": [{"product_id": 12, "quantity": 2}, ...]}  (same as checkout)
+        """
+        serializer = CartQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.quote())
+
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
-        # Ensure user can only cancel their own ONLINE orders
-        order = self.get_object()
-        if order.user_id != request.user.id:
-            return Response(
-                {"detail": "You can only cancel your own online orders."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-        if order.status != OrderStatus.PENDING:
-            return Response(
-                {"detail": "Only pending orders can be cancelled."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         with transaction.atomic():
+            order = self.get_object()
+            # Ensure user can only cancel their own ONLINE orders
+            if order.user_id != request.user.id:
+                return Response(
+                    {"detail": "You can only cancel your own online orders."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            if order.status != OrderStatus.PENDING:
+                return Response(
+                    {"detail": "Only pending orders can be cancelled."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             # Release the units this pending order was holding, then cancel.
             _transition_order_inventory(
                 order, order.status, OrderStatus.CANCELLED, request.user
@@ -685,21 +872,28 @@ class UserOrderViewSet(viewsets.ModelViewSet):
             order.save(update_fields=["status"])
         return Response(OrderSerializer(order, context={"request": request}).data)
 
-    @action(detail=True, methods=["post"], url_path="remove-item")
-    def remove_item(self, request, pk=None):
-        order = self.get_object()
-        if order.user_id != request.user.id:
+    def _check_editable(self, order):
+        """Error response if the caller may not edit `order`'s lines, else None."""
+        if order.user_id != self.request.user.id:
             return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
         if order.status != OrderStatus.PENDING:
             return Response({"detail": "Only pending orders can be edited."}, status=status.HTTP_400_BAD_REQUEST)
+        return None
 
+    @action(detail=True, methods=["post"], url_path="remove-item")
+    def remove_item(self, request, pk=None):
         item_id = request.data.get("item_id")
-        if not item_id:
-            return Response({"detail": "item_id is required."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             with transaction.atomic():
-                item = order.items.select_related("product").get(id=item_id)
+                order = self.get_object()
+                denied = self._check_editable(order)
+                if denied:
+                    return denied
+                if not item_id:
+                    return Response({"detail": "item_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+                item = order.items.get(id=item_id)
                 # Lock the product row and release its reservation (PENDING order).
                 product = Product.objects.select_for_update().get(pk=item.product_id)
                 _adjust_item_inventory(order, product, -item.quantity, request.user)
@@ -714,27 +908,24 @@ class UserOrderViewSet(viewsets.ModelViewSet):
         except OrderItem.DoesNotExist:
             return Response({"detail": "Item not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Re-fetch to clear prefetch caches
-        order = self.get_queryset().get(pk=order.pk)
-        return Response(UserOrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, UserOrderSerializer, request)
 
     @action(detail=True, methods=["post"], url_path="add-item")
     def add_item(self, request, pk=None):
-        order = self.get_object()
-        if order.user_id != request.user.id:
-            return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
-        if order.status != OrderStatus.PENDING:
-            return Response({"detail": "Only pending orders can be edited."}, status=status.HTTP_400_BAD_REQUEST)
-
         product_id = request.data.get("product_id")
         quantity = int(request.data.get("quantity", 1))
-        if not product_id:
-            return Response({"detail": "product_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-        if quantity < 1:
-            return Response({"detail": "Quantity must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             with transaction.atomic():
+                order = self.get_object()
+                denied = self._check_editable(order)
+                if denied:
+                    return denied
+                if not product_id:
+                    return Response({"detail": "product_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+                if quantity < 1:
+                    return Response({"detail": "Quantity must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
+
                 # Lock the product row first so the check-and-reserve is atomic.
                 product = Product.objects.select_for_update().get(id=product_id)
                 try:
@@ -760,25 +951,23 @@ class UserOrderViewSet(viewsets.ModelViewSet):
         except Product.DoesNotExist:
             return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        order = self.get_queryset().get(pk=order.pk)
-        return Response(UserOrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, UserOrderSerializer, request)
 
     @action(detail=True, methods=["post"], url_path="update-item-quantity")
     def update_item_quantity(self, request, pk=None):
-        order = self.get_object()
-        if order.user_id != request.user.id:
-            return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
-        if order.status != OrderStatus.PENDING:
-            return Response({"detail": "Only pending orders can be edited."}, status=status.HTTP_400_BAD_REQUEST)
-
         item_id = request.data.get("item_id")
         new_qty = int(request.data.get("quantity", 0))
-        if not item_id or new_qty < 1:
-            return Response({"detail": "Invalid item_id or quantity."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             with transaction.atomic():
-                item = order.items.select_related("product").get(id=item_id)
+                order = self.get_object()
+                denied = self._check_editable(order)
+                if denied:
+                    return denied
+                if not item_id or new_qty < 1:
+                    return Response({"detail": "Invalid item_id or quantity."}, status=status.HTTP_400_BAD_REQUEST)
+
+                item = order.items.get(id=item_id)
                 product = Product.objects.select_for_update().get(pk=item.product_id)
                 diff = new_qty - item.quantity
 
@@ -799,8 +988,32 @@ class UserOrderViewSet(viewsets.ModelViewSet):
         except OrderItem.DoesNotExist:
             return Response({"detail": "Item not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        order = self.get_queryset().get(pk=order.pk)
-        return Response(UserOrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, UserOrderSerializer, request)
+
+    @action(detail=True, methods=["post"], url_path="edit-items")
+    def edit_items(self, request, pk=None):
+        """
+        Apply several line edits in one request, all or nothing.
+        Body: {"operations": [
+            {"op": "add", "product_id": 12, "quantity": 2},
+            {"op": "update", "item_id": 34, "quantity": 5},
+            {"op": "remove", "item_id": 56}
+        ]}
+        """
+        serializer = OrderItemsEditSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                order = self.get_object()
+                denied = self._check_editable(order)
+                if denied:
+                    return denied
+                _apply_item_edits(order, serializer.validated_data["operations"], request.user)
+        except InsufficientStock as e:
+            return Response({"detail": f"Not enough stock for {e.product.name}. Available: {e.available}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return _order_response(order, UserOrderSerializer, request)
 
 
 class AdminOrderViewSet(viewsets.ModelViewSet):
@@ -810,18 +1023,16 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
     - GET   /api/admin/orders/{id}/        -> retrieve (any)
     - PATCH /api/admin/orders/{id}/status/ -> change status
     - POST  /api/admin/orders/{id}/cancel/ -> cancel if pending
+    - POST  /api/admin/orders/{id}/edit-items/ -> several add/update/remove edits at once
     (Admin does not create orders in this API)
     """
     permission_classes = [permissions.IsAdminUser]
     http_method_names = ["get", "patch", "post", "head", "options"]  # no PUT/DELETE
 
     def get_queryset(self):
-        qs = (
-            Order.objects
-            .select_related("user")
-            .prefetch_related("items__product", "invoices")
-            .order_by("-created_at")
-        )
+        if self.action in ORDER_ROW_ACTIONS | LINE_EDIT_ACTIONS:
+            return _locked_queryset(self.action)
+        qs = _with_read_projection(Order.objects).order_by("-created_at")
         return _filtered_queryset(self.request, qs)
 
     def get_serializer_class(self):
@@ -833,7 +1044,6 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["patch"])
     def status(self, request, pk=None):
-        order = self.get_object()
         new_status = request.data.get("status")
         valid = {c for c, _ in OrderStatus.choices}
         if new_status not in valid:
@@ -841,9 +1051,10 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
                 {"detail": f"Invalid status. Use one of {sorted(list(valid))}."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        old_status = order.status
         try:
             with transaction.atomic():
+                order = self.get_object()
+                old_status = order.status
                 # Move inventory between reserved/stock buckets if the status
                 # change crosses a phase boundary (e.g. PENDING -> CONFIRMED
                 # commits the reservation as a real sale).
@@ -858,13 +1069,13 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
-        order = self.get_object()
-        if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
-            return Response(
-                {"detail": "Cannot cancel delivered/already-cancelled orders."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         with transaction.atomic():
+            order = self.get_object()
+            if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+                return Response(
+                    {"detail": "Cannot cancel delivered/already-cancelled orders."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             # PENDING orders release their reservation; confirmed orders restore
             # the physical stock they had deducted.
             _transition_order_inventory(
@@ -880,20 +1091,20 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         Remove a specific item from the order.
         Body: {"item_id": 123}
         """
-        order = self.get_object()
         item_id = request.data.get("item_id")
         
         if not item_id:
             return Response({"detail": "item_id is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Allow basic editing only if PENDING (or CONFIRMED, depending on policy)
-        # Assuming we can edit as long as it's not Delivered/Cancelled
-        if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
-             return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
-
         try:
             with transaction.atomic():
-                item = order.items.select_related("product").get(id=item_id)
+                order = self.get_object()
+                # Allow basic editing only if PENDING (or CONFIRMED, depending on policy)
+                # Assuming we can edit as long as it's not Delivered/Cancelled
+                if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+                    return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
+
+                item = order.items.get(id=item_id)
                 # Free the units this line held (reservation if PENDING, else stock).
                 product = Product.objects.select_for_update().get(pk=item.product_id)
                 _adjust_item_inventory(order, product, -item.quantity, request.user)
@@ -908,7 +1119,7 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         except OrderItem.DoesNotExist:
             return Response({"detail": "Item not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(OrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, OrderSerializer, request)
 
     @action(detail=True, methods=["post"], url_path="confirm-order")
     def confirm_order(self, request, pk=None):
@@ -916,17 +1127,17 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         Confirm order and optionally update price.
         Body: {"total_amount": 500.00}
         """
-        order = self.get_object()
+        with transaction.atomic():
+            order = self.get_object()
 
-        # Only allow confirming if Pending
-        if order.status != OrderStatus.PENDING:
-            return Response({"detail": "Order is not in Pending state."}, status=status.HTTP_400_BAD_REQUEST)
+            # Only allow confirming if Pending
+            if order.status != OrderStatus.PENDING:
+                return Response({"detail": "Order is not in Pending state."}, status=status.HTTP_400_BAD_REQUEST)
 
-        new_total = request.data.get("total_amount")
-        if new_total is not None:
-            order.total_amount = new_total
+            new_total = request.data.get("total_amount")
+            if new_total is not None:
+                order.total_amount = new_total
 
-        with transaction.atomic():
             # Convert this order's reservations into real stock decrements.
             _transition_order_inventory(
                 order, order.status, OrderStatus.CONFIRMED, request.user
@@ -942,15 +1153,6 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         Update total_amount for orders in PENDING, CONFIRMED, or RECEIVED state.
         Body: {"total_amount": 500.00}
         """
-        order = self.get_object()
-
-        allowed = [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.RECEIVED]
-        if order.status not in allowed:
-            return Response(
-                {"detail": "Amount can only be edited for Pending, Confirmed, or Received orders."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         new_total = request.data.get("total_amount")
         if new_total is None:
             return Response({"detail": "total_amount is required."}, status=status.HTTP_400_BAD_REQUEST)
@@ -962,8 +1164,18 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         except (ValueError, TypeError):
             return Response({"detail": "total_amount must be a non-negative number."}, status=status.HTTP_400_BAD_REQUEST)
 
-        order.total_amount = new_total
-        order.save(update_fields=["total_amount"])
+        with transaction.atomic():
+            order = self.get_object()
+
+            allowed = [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.RECEIVED]
+            if order.status not in allowed:
+                return Response(
+                    {"detail": "Amount can only be edited for Pending, Confirmed, or Received orders."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            order.total_amount = new_total
+            order.save(update_fields=["total_amount"])
         return Response(OrderSerializer(order, context={"request": request}).data)
 
     @action(detail=True, methods=["post"], url_path="add-item")
@@ -972,20 +1184,20 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         Add a product to the order.
         Body: {"product_id": 12, "quantity": 1}
         """
-        order = self.get_object()
         product_id = request.data.get("product_id")
         quantity = int(request.data.get("quantity", 1))
 
         if not product_id:
             return Response({"detail": "product_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
-             return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
         if quantity < 1:
             return Response({"detail": "Quantity must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             with transaction.atomic():
+                order = self.get_object()
+                if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+                    return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
+
                 # Lock the product row first so the check-and-apply is atomic.
                 product = Product.objects.select_for_update().get(id=product_id)
                 try:
@@ -1014,7 +1226,7 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         except Product.DoesNotExist:
             return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(OrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, OrderSerializer, request)
 
     @action(detail=True, methods=["post"], url_path="update-item-quantity")
     def update_item_quantity(self, request, pk=None):
@@ -1022,7 +1234,6 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         Update quantity of an existing item.
         Body: {"item_id": 123, "quantity": 5}
         """
-        order = self.get_object()
         item_id = request.data.get("item_id")
         new_quantity = int(request.data.get("quantity", 0))
 
@@ -1032,12 +1243,13 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         if new_quantity < 1:
              return Response({"detail": "Quantity must be at least 1. Use remove-item to delete."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
-             return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
-
         try:
             with transaction.atomic():
-                item = order.items.select_related("product").get(id=item_id)
+                order = self.get_object()
+                if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+                    return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
+
+                item = order.items.get(id=item_id)
                 product = Product.objects.select_for_update().get(pk=item.product_id)
                 diff = new_quantity - item.quantity
 
@@ -1062,4 +1274,28 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
         except OrderItem.DoesNotExist:
             return Response({"detail": "Item not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(OrderSerializer(order, context={"request": request}).data)
+        return _order_response(order, OrderSerializer, request)
+
+    @action(detail=True, methods=["post"], url_path="edit-items")
+    def edit_items(self, request, pk=None):
+        """
+        Apply several line edits in one request, all or nothing.
+        Body: {"operations": [
+            {"op": "add", "product_id": 12, "quantity": 2},
+            {"op": "update", "item_id": 34, "quantity": 5},
+            {"op": "remove", "item_id": 56}
+        ]}
+        """
+        serializer = OrderItemsEditSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                order = self.get_object()
+                if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+                    return Response({"detail": "Cannot edit completed/cancelled orders."}, status=status.HTTP_400_BAD_REQUEST)
+                _apply_item_edits(order, serializer.validated_data["operations"], request.user)
+        except InsufficientStock as e:
+            return Response({"detail": f"Not enough stock for {e.product.name}. Available: {e.available}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return _order_response(order, OrderSerializer, request)
@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.urls import path
@@ -11,7 +14,7 @@ from django.core.exceptions import FieldDoesNotExist
 import csv, io, re
 from decimal import Decimal, InvalidOperation
 
-from .models import Category, Product, StockMovement
+from .models import CatalogSnapshot, Category, Product, StockMovement, StockMovementRollup
 
 
 # -------------------- helpers --------------------
@@ -114,14 +117,76 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('name',)
 
 
+class RecentWindowFilter(admin.SimpleListFilter):
+    """
+    Bounds the ledger changelist to a recent window by default so the list,
+    date hierarchy and counts never scan the whole (ever-growing) table.
+    Pick "All" explicitly to browse older rows.
+    """
+    title = 'window'
+    parameter_name = 'window'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('7', 'Last 7 days'),
+            ('30', 'Last 30 days'),
+            ('90', 'Last 90 days'),
+            ('365', 'Last year'),
+            ('all', 'All'),
+        )
+
+    def _default(self):
+        return str(getattr(settings, 'STOCK_MOVEMENT_ADMIN_WINDOW_DAYS', 30))
+
+    def value(self):
+        return super().value() or self._default()
+
+    def choices(self, changelist):
+        current = self.value()
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': current == lookup,
+                'query_string': changelist.get_query_string({self.parameter_name: lookup}),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == 'all' or not value.isdigit():
+            return queryset
+        return queryset.filter(created_at__gte=timezone.now() - timedelta(days=int(value)))
+
+
 @admin.register(StockMovement)
 class StockMovementAdmin(admin.ModelAdmin):
     """Read-only audit ledger of stock changes."""
     list_display = ('created_at', 'product', 'delta', 'balance_after', 'reason', 'reference', 'created_by')
-    list_filter = ('reason', 'created_at')
+    list_filter = (RecentWindowFilter, 'reason')
+    list_select_related = ('product', 'created_by')
     search_fields = ('product__name', 'reference')
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
+    # Skip the unfiltered COUNT(*) over the whole ledger on every page load.
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockMovementRollup)
+class StockMovementRollupAdmin(admin.ModelAdmin):
+    """Monthly summaries of archived ledger rows (see products.archive)."""
+    list_display = ('month', 'product', 'movements', 'units_in', 'units_out', 'closing_balance', 'archive_name')
+    list_select_related = ('product',)
+    search_fields = ('product__name',)
+    date_hierarchy = 'month'
+    ordering = ('-month', 'product')
 
     def has_add_permission(self, request):
         return False
@@ -136,8 +201,8 @@ class StockMovementAdmin(admin.ModelAdmin):
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     # ---- your existing config (kept) ----
-    list_display = ('name', 'category', 'price', 'stock', 'thumb')
-    list_filter = ('category',)
+    list_display = ('name', 'category', 'price', 'stock', 'thumb', 'image_status')
+    list_filter = ('category', 'image_status')
     search_fields = ('name', 'category__name')
     readonly_fields = ('preview',)
     fields = ('name', 'category', 'price', 'stock', 'image', 'preview')
@@ -250,3 +315,17 @@ class ProductAdmin(admin.ModelAdmin):
             filename=f"inventory_{now}.xlsx",
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
+
+
+@admin.register(CatalogSnapshot)
+class CatalogSnapshotAdmin(admin.ModelAdmin):
+    """Published catalog snapshots (see products.snapshot)."""
+    list_display = ('key', 'created_at', 'products', 'size', 'catalog_version', 'path')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,174 @@
+"""
+Monthly archival of the `StockMovement` ledger.
+
+Every sale, return, stock-take and bulk edit appends to `StockMovement`, so
+the table grows without bound. Months older than a retention window are moved
+out of the hot table:
+
+  1. the month's raw rows are streamed into a gzipped CSV and saved to the
+     default storage (S3 in production) under `ARCHIVE_PREFIX`;
+  2. one `StockMovementRollup` row per product keeps the month's totals and
+     closing balance;
+  3. the archived rows are deleted.
+
+Steps 2 and 3 run in one transaction per month, so a failure never leaves a
+month half-deleted. Each month has exactly one archive file: re-archiving a
+month (rows back-dated after an earlier run) appends the new rows to it as
+another gzip member, so every rollup row keeps pointing at all of the
+month's raw rows. Driven by `manage.py archive_stock_movements`.
+"""
+
+import csv
+import gzip
+import io
+import tempfile
+from datetime import date, datetime
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .images import save_exact
+from .models import StockMovement, StockMovementRollup
+
+ARCHIVE_PREFIX = "archives/stock_movements"
+CSV_COLUMNS = [
+    "id", "product_id", "delta", "balance_after", "reason",
+    "reference", "note", "created_by_id", "created_at",
+]
+
+
+def month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def add_months(d, n):
+    m = d.month - 1 + n
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def _aware(d):
+    return timezone.make_aware(datetime(d.year, d.month, d.day))
+
+
+def cutoff_for(keep_months, now=None):
+    """First day of the oldest month that is kept in the hot table."""
+    now = timezone.localtime(now or timezone.now())
+    return add_months(month_start(now.date()), -int(keep_months))
+
+
+def archivable_months(cutoff):
+    """Months (as first-of-month dates) with ledger rows older than `cutoff`."""
+    qs = StockMovement.objects.filter(created_at__lt=_aware(cutoff))
+    return [month_start(d) for d in qs.dates("created_at", "month", order="ASC")]
+
+
+def archive_name_for(month):
+    return f"{ARCHIVE_PREFIX}/{month:%Y-%m}.csv.gz"
+
+
+def _previous_archive(month):
+    """Storage name of the month's existing archive, if any."""
+    name = (
+        StockMovementRollup.objects.filter(month=month)
+        .exclude(archive_name="")
+        .values_list("archive_name", flat=True)
+        .first()
+    )
+    if name and default_storage.exists(name):
+        return name
+    name = archive_name_for(month)
+    return name if default_storage.exists(name) else None
+
+
+def archive_month(month, *, dry_run=False):
+    """
+    Archive every ledger row created in `month`. Returns a summary dict with
+    `rows`, `products` and `archive_name` (None on a dry run or empty month).
+    """
+    start, end = _aware(month), _aware(add_months(month, 1))
+    rows = StockMovement.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    rollups = {}
+    max_id = None
+    count = 0
+    previous = None if dry_run else _previous_archive(month)
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode="wb") as gz:
+            text = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            if previous is None:
+                # Appended members continue the earlier file's CSV.
+                writer.writerow(CSV_COLUMNS)
+            # Ascending order so the last row seen per product is its closing balance.
+            for m in rows.order_by("created_at", "id").values_list(*CSV_COLUMNS).iterator(chunk_size=2000):
+                writer.writerow(m)
+                count += 1
+                max_id = m[0] if max_id is None else max(max_id, m[0])
+                _, pid, delta, balance_after = m[:4]
+                r = rollups.setdefault(pid, {"movements": 0, "units_in": 0, "units_out": 0})
+                r["movements"] += 1
+                if delta >= 0:
+                    r["units_in"] += delta
+                else:
+                    r["units_out"] += -delta
+                r["closing_balance"] = balance_after
+            text.flush()
+            text.detach()
+
+        summary = {"month": month, "rows": count, "products": len(rollups), "archive_name": None}
+        if dry_run or not count:
+            return summary
+
+        tmp.seek(0)
+        name = archive_name_for(month)
+        if previous is None:
+            name = default_storage.save(name, File(tmp, name=f"{month:%Y-%m}.csv.gz"))
+        else:
+            # Concatenated gzip members decompress as one stream.
+            with default_storage.open(previous, "rb") as fh:
+                data = fh.read() + tmp.read()
+            save_exact(default_storage, name, data)
+            if previous != name:
+                # An archive from before names were fixed per month.
+                default_storage.delete(previous)
+    summary["archive_name"] = name
+
+    with transaction.atomic():
+        existing = {
+            r.product_id: r
+            for r in StockMovementRollup.objects.select_for_update().filter(
+                month=month, product_id__in=list(rollups)
+            )
+        }
+        to_create, to_update = [], []
+        for pid, r in rollups.items():
+            old = existing.get(pid)
+            if old is None:
+                to_create.append(StockMovementRollup(
+                    product_id=pid, month=month, archive_name=name, **r
+                ))
+                continue
+            # Re-archiving a month (e.g. rows back-dated after a previous run):
+            # fold the new rows into the existing rollup.
+            old.movements += r["movements"]
+            old.units_in += r["units_in"]
+            old.units_out += r["units_out"]
+            old.closing_balance = r["closing_balance"]
+            old.archive_name = name
+            to_update.append(old)
+        if to_create:
+            StockMovementRollup.objects.bulk_create(to_create)
+        if to_update:
+            StockMovementRollup.objects.bulk_update(
+                to_update,
+                ["movements", "units_in", "units_out", "closing_balance", "archive_name"],
+            )
+        # Products missing from this batch still point at the month's file.
+        StockMovementRollup.objects.filter(month=month).exclude(archive_name=name).update(archive_name=name)
+        # Bounded by max_id so rows written after the export are never lost.
+        rows.filter(id__lte=max_id).delete()
+
+    return summary
@@ -0,0 +1,119 @@
+"""
+In-process prefix index for as-you-type product suggestions.
+
+Each instance keeps every product's id, name, category, price and
+availability in memory, plus two sorted key arrays:
+
+* full names ("green apple"), so "gre" suggests it first;
+* every word start ("apple"), so "app" finds it too.
+
+A lookup is a binary search to the first key with the typed prefix,
+followed by a walk that stops after `limit` distinct products: O(log n + limit),
+a few microseconds for this catalog. Full-name matches rank before
+word-start matches, alphabetical within each.
+
+The index is built lazily on first use and rebuilt when the catalog version
+(products.catalog_cache) changes. The version is checked at most once per
+VERSION_CHECK_SECONDS, so most keystrokes don't even touch the shared cache.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .catalog_cache import current_version
+from .models import Product
+from .search import normalize
+
+VERSION_CHECK_SECONDS = getattr(settings, "AUTOCOMPLETE_VERSION_CHECK_SECONDS", 1.0)
+# Rebuild interval when the catalog version can't be read.
+UNVERSIONED_MAX_AGE = 60
+
+
+class PrefixIndex:
+    def __init__(self, rows):
+        self.products = {}
+        full, words = [], []
+        for row in rows:
+            self.products[row["id"]] = row
+            parts = normalize(row["name"]).split()
+            if not parts:
+                continue
+            full.append((" ".join(parts), row["id"]))
+            for i in range(1, len(parts)):
+                words.append((" ".join(parts[i:]), row["id"]))
+        full.sort()
+        words.sort()
+        self._tiers = [
+            ([key for key, _ in full], [pid for _, pid in full]),
+            ([key for key, _ in words], [pid for _, pid in words]),
+        ]
+
+    def __len__(self):
+        return len(self.products)
+
+    def lookup(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        seen, found = set(), []
+        for keys, ids in self._tiers:
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(found) < limit and keys[i].startswith(prefix):
+                pid = ids[i]
+                if pid not in seen:
+                    seen.add(pid)
+                    found.append(self.products[pid])
+                i += 1
+        return found
+
+
+def _build():
+    rows = (
+        Product.objects
+        .annotate(category_name=F("category__name"), available=Greatest(F("stock") - F("reserved"), Value(0)))
+        .values("id", "name", "category_name", "price", "available")
+    )
+    return PrefixIndex(
+        {
+            "id": r["id"],
+            "name": r["name"],
+            "category": r["category_name"],
+            "price": r["price"],
+            "available": r["available"],
+        }
+        for r in rows
+    )
+
+
+_lock = threading.Lock()
+_state = {"index": None, "version": None, "built_at": 0.0, "checked_at": 0.0}
+
+
+def get_index():
+    """The current process's index, (re)built if the catalog has changed."""
+    now = time.monotonic()
+    index = _state["index"]
+    if index is not None and now - _state["checked_at"] < VERSION_CHECK_SECONDS:
+        return index
+
+    version = current_version()
+    with _lock:
+        _state["checked_at"] = time.monotonic()
+        index = _state["index"]
+        stale = (
+            index is None
+            or (version is not None and version != _state["version"])
+            or (version is None and now - _state["built_at"] > UNVERSIONED_MAX_AGE)
+        )
+        if stale:
+            index = _build()
+            _state.update(index=index, version=version, built_at=time.monotonic())
+    return index
+
+
+def suggest(query, limit=10):
+    return get_index().lookup(query, limit)
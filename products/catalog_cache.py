@@ -0,0 +1,115 @@
+"""
+Two-tier cache for catalog reads, invalidated by a catalog version.
+
+Tiers (aliases in settings.CACHES):
+
+* `catalog-local` — per-instance LocMemCache. Bounded by MAX_ENTRIES and
+  evicts least-recently-used entries first, so a warm instance serves repeat
+  pages without any I/O.
+* `shared` — Redis when REDIS_URL is set, otherwise the `fps_cache` database
+  table (created by migration products/0012); a LocMemCache stand-in locally.
+  Lets a fresh serverless instance reuse a page another instance already built.
+
+Coherence comes from the catalog version, a token stored in the shared tier.
+Every cached value's key embeds the version it was built under, and each read
+fetches the current version first, so once a write bumps it every instance
+stops hitting the old entries (they simply age out). Writers don't call
+`bump_catalog_version()` directly: they call `catalog_changed()`, which bumps
+once when the surrounding transaction commits, so a reader can never cache
+data from before the commit under the new version.
+
+Expired pages are rebuilt by one request at a time while the others serve
+the previous copy (FPSDayalbaghBackend.singleflight). A version bump has no
+previous copy under the new key, so readers wait for that one rebuild
+rather than see pre-write data.
+
+If the shared tier is unreachable reads fall through to the database uncached
+rather than failing.
+"""
+import hashlib
+import logging
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from FPSDayalbaghBackend import singleflight
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE = getattr(settings, "CATALOG_CACHE_LOCAL", "catalog-local")
+SHARED_CACHE = getattr(settings, "CATALOG_CACHE_SHARED", "shared")
+CATALOG_CACHE_TIMEOUT = getattr(settings, "CATALOG_CACHE_TIMEOUT", 300)
+# How long an expired page may still be served while one request rebuilds it.
+CATALOG_CACHE_STALE = getattr(settings, "CATALOG_CACHE_STALE", 60)
+
+VERSION_KEY = "catalog:version"
+
+
+def _shared_call(method, *args):
+    try:
+        return getattr(caches[SHARED_CACHE], method)(*args)
+    except Exception:
+        logger.warning("Shared cache %s() failed", method, exc_info=True)
+        return None
+
+
+def current_version():
+    """The current catalog version, or None when the shared tier is unavailable."""
+    version = _shared_call("get", VERSION_KEY)
+    if version is None:
+        # First use, or the key was evicted: start a new version. `add` keeps
+        # whichever instance got there first.
+        _shared_call("add", VERSION_KEY, uuid.uuid4().hex[:12], None)
+        version = _shared_call("get", VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Start a new catalog version right now; prefer `catalog_changed()`."""
+    _shared_call("set", VERSION_KEY, uuid.uuid4().hex[:12], None)
+
+
+def _bump_if_changed(connection):
+    if connection.catalog_bump_pending:
+        connection.catalog_bump_pending = False
+        bump_catalog_version()
+
+
+def catalog_changed():
+    """
+    Record that products/categories changed. Bumps the version when the
+    current transaction commits (immediately in autocommit), once per
+    transaction however many rows were touched.
+    """
+    connection = transaction.get_connection()
+    # Every call registers a hook, so one dropped by a rolled-back savepoint
+    # doesn't lose the bump; the first hook to run on commit clears the flag
+    # and the rest do nothing.
+    connection.catalog_bump_pending = True
+    transaction.on_commit(partial(_bump_if_changed, connection))
+
+
+def request_key(request, name):
+    """Cache key for a read that depends only on the host and query string."""
+    query = "&".join(sorted(f"{k}={v}" for k, values in request.GET.lists() for v in values))
+    digest = hashlib.sha1(f"{request.get_host()}?{query}".encode()).hexdigest()
+    return f"{name}:{digest}"
+
+
+def get_or_build(key, build):
+    """
+    Return the cached value for `key` under the current catalog version,
+    building it at most once across concurrent requests on a miss (see
+    FPSDayalbaghBackend.singleflight).
+    """
+    version = current_version()
+    if version is None:
+        return build()
+    return singleflight.get_or_build(
+        f"catalog:{version}:{key}", build,
+        fresh=CATALOG_CACHE_TIMEOUT, stale=CATALOG_CACHE_STALE,
+        local=LOCAL_CACHE, shared=SHARED_CACHE,
+    )
@@ -0,0 +1,152 @@
+"""
+Deferred product image processing.
+
+`Product.save()` stores a fresh upload untouched and marks the product
+`image_status=pending`, so admin saves and `PATCH /api/products/<id>/` return
+as soon as the original is in storage. Decoding, the `MAX_IMAGE_DIM` JPEG and
+every responsive variant (see `products.images`) are produced here, outside
+the request, and swapped onto the product in one UPDATE when done. Until then
+clients are served the original upload.
+
+There is no worker process on Vercel, so the queue is the product table
+itself. It is drained by:
+
+* a Vercel cron (see `vercel.json`) that calls
+  `GET /api/products/images/process/` every few minutes,
+* `POST /api/products/images/process/` (admin), to process a batch right away,
+* `manage.py process_product_images` (e.g. after a bulk import).
+
+Each endpoint call works through a bounded batch within
+`PRODUCT_IMAGE_PROCESS_BUDGET_SECONDS` so it stays well inside the function
+time limit; call it again while `remaining` > 0.
+
+Each product is claimed with a conditional UPDATE, so concurrent drainers never
+process the same upload twice; a claim left behind by a crashed run is retried
+after `PRODUCT_IMAGE_STALE_MINUTES`.
+"""
+import logging
+import posixpath
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .catalog_cache import catalog_changed
+from .images import build_variants, load_upload, to_jpeg_upload
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+Status = Product.ImageStatus
+
+PROCESS_BUDGET_SECONDS = getattr(settings, "PRODUCT_IMAGE_PROCESS_BUDGET_SECONDS", 20)
+STALE_AFTER = timedelta(minutes=getattr(settings, "PRODUCT_IMAGE_STALE_MINUTES", 15))
+
+
+def _queue_filter(retry_failed=False):
+    statuses = [Status.PENDING]
+    if retry_failed:
+        statuses.append(Status.FAILED)
+    stale = Q(image_status=Status.PROCESSING, image_queued_at__lt=timezone.now() - STALE_AFTER)
+    return Q(image_status__in=statuses) | stale
+
+
+def queued(retry_failed=False):
+    """Products waiting for processing, oldest upload first."""
+    return (
+        Product.objects.filter(_queue_filter(retry_failed))
+        .exclude(image="").exclude(image__isnull=True)
+        .order_by("image_queued_at", "id")
+    )
+
+
+def _claim(product_id, retry_failed=False):
+    """
+    Move one queued product to PROCESSING. Returns the stored name of its
+    original upload, or None if it isn't queued any more (another run claimed
+    it, or it was processed or cleared in the meantime).
+    """
+    row = (
+        Product.objects.filter(pk=product_id)
+        .filter(_queue_filter(retry_failed))
+        .values_list("image", "image_status", "image_queued_at")
+        .first()
+    )
+    if row is None or not row[0]:
+        return None
+    name, status, queued_at = row
+    claimed = Product.objects.filter(
+        pk=product_id, image=name, image_status=status, image_queued_at=queued_at,
+    ).update(image_status=Status.PROCESSING, image_queued_at=timezone.now())
+    return name if claimed else None
+
+
+def process_product_image(product_id, retry_failed=False):
+    """
+    Compress one queued upload and render its variants, then swap them onto the
+    product. Returns True on success, False on failure (the product is marked
+    FAILED and keeps serving the original) and None if there was nothing to do.
+    """
+    original = _claim(product_id, retry_failed)
+    if original is None:
+        return None
+
+    field = Product._meta.get_field("image")
+    storage = field.storage
+    name = None
+    try:
+        with storage.open(original, "rb") as fh:
+            img = load_upload(fh)
+        jpeg = to_jpeg_upload(img, posixpath.basename(original))
+        name = storage.save(field.generate_filename(None, jpeg.name), jpeg)
+        variants = build_variants(name, img, storage=storage)
+    except Exception:
+        logger.exception("Image processing failed for product %s (%s)", product_id, original)
+        if name:
+            storage.delete(name)
+        Product.objects.filter(pk=product_id, image=original).update(image_status=Status.FAILED)
+        return False
+
+    # Only swap if the product still points at the upload we processed; a newer
+    # upload queued meanwhile wins and our output is discarded.
+    swapped = Product.objects.filter(pk=product_id, image=original).update(
+        image=name,
+        image_variants=variants,
+        image_status=Status.READY,
+        image_queued_at=None,
+    )
+    if not swapped:
+        storage.delete(name)
+        return None
+    catalog_changed()
+    if name != original:
+        storage.delete(original)
+    return True
+
+
+def process_pending(limit=None, budget=None, retry_failed=False):
+    """
+    Work through the queue, oldest first. Stops after `limit` products or once
+    `budget` seconds have elapsed (checked before starting each product).
+    Returns counts of processed/failed/skipped products and how many remain.
+    """
+    deadline = time.monotonic() + budget if budget else None
+    ids = queued(retry_failed).values_list("id", flat=True)
+    if limit:
+        ids = ids[:limit]
+
+    stats = {"processed": 0, "failed": 0, "skipped": 0}
+    for product_id in list(ids):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        result = process_product_image(product_id, retry_failed)
+        if result is None:
+            stats["skipped"] += 1
+        elif result:
+            stats["processed"] += 1
+        else:
+            stats["failed"] += 1
+    stats["remaining"] = queued().count()
+    return stats
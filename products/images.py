@@ -0,0 +1,213 @@
+"""
+Product image pipeline.
+
+An upload is decoded once, downscaled to `MAX_IMAGE_DIM` and stored as the
+product's main JPEG (`Product.image`); this runs off-request, see
+`products.image_queue`. From the same decoded image we render
+responsive variants — `thumb`, `medium` and `full` widths — in WebP (and AVIF
+when this Pillow build supports it), plus JPEG for the smaller sizes, so list
+screens download a few KB instead of the full-size photo.
+
+Variants live under deterministic keys derived from the main image name:
+
+    products/foo.jpg  ->  products/variants/foo/thumb.webp, .../medium.avif, ...
+
+and their storage names are recorded on `Product.image_variants` as
+`{size: {format: name, "width": px}}` so serializers can build URLs (and
+srcset width descriptors) without touching storage. `width` is the variant's
+actual pixel width, which for portrait or small images differs from the
+nominal size in VARIANT_SIZES.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+
+from PIL import Image, features
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import InMemoryUploadedFile
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_DIM = 1200   # px on the longest side
+JPEG_QUALITY = 80
+
+# Longest-side pixel sizes, smallest first.
+VARIANT_SIZES = {
+    "thumb": 160,
+    "medium": 480,
+    "full": MAX_IMAGE_DIM,
+}
+
+_ENCODERS = {
+    "avif": {"format": "AVIF", "quality": 55},
+    "webp": {"format": "WEBP", "quality": 75, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": JPEG_QUALITY, "optimize": True, "progressive": True},
+}
+
+CONTENT_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+def variant_formats():
+    """Modern formats this Pillow build can encode, best first."""
+    fmts = []
+    if features.check("avif"):
+        fmts.append("avif")
+    if features.check("webp"):
+        fmts.append("webp")
+    return fmts
+
+
+def load_upload(field_file):
+    """Decode an upload once into an RGB image no larger than MAX_IMAGE_DIM."""
+    img = Image.open(field_file)
+    if img.mode in ("RGBA", "P", "LA"):
+        img = img.convert("RGB")
+    img.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM), Image.Resampling.LANCZOS)
+    # thumbnail() is a no-op for small images; force decoding so `img` stays
+    # usable after the source file is closed.
+    img.load()
+    return img
+
+
+def encode(img, fmt):
+    buf = io.BytesIO()
+    img.save(buf, **_ENCODERS[fmt])
+    return buf.getvalue()
+
+
+def to_jpeg_upload(img, original_name):
+    """Wrap `img` as the in-memory JPEG upload stored in Product.image."""
+    data = encode(img, "jpeg")
+    base = original_name.rsplit(".", 1)[0] if "." in original_name else original_name
+    return InMemoryUploadedFile(
+        io.BytesIO(data),
+        field_name="image",
+        name=f"{base}.jpg",
+        content_type="image/jpeg",
+        size=len(data),
+        charset=None,
+    )
+
+
+def variant_name(image_name, size, fmt):
+    stem = posixpath.splitext(posixpath.basename(image_name))[0]
+    return f"products/variants/{stem}/{size}.{fmt}"
+
+
+def render_variants(img):
+    """
+    Encode every (size, format) variant of an already-loaded image. Returns
+    `{size: (width, {format: bytes})}`. The full-size JPEG is the main image
+    itself and is not duplicated here.
+    """
+    out = {}
+    fmts = variant_formats()
+    for size, px in VARIANT_SIZES.items():
+        if max(img.size) > px:
+            scaled = img.copy()
+            scaled.thumbnail((px, px), Image.Resampling.LANCZOS)
+        else:
+            scaled = img
+        encoded = {fmt: encode(scaled, fmt) for fmt in fmts}
+        if size != "full":
+            encoded["jpeg"] = encode(scaled, "jpeg")
+        out[size] = (scaled.size[0], encoded)
+    return out
+
+
+def store_variants(image_name, rendered, storage=None):
+    """
+    Save rendered variants under their deterministic keys and return the
+    `{size: {format: name, "width": px}}` map for Product.image_variants. A key
+    that already exists is assumed to hold the same variant and is not
+    re-uploaded.
+    """
+    storage = storage or default_storage
+    names = {}
+    for size, (width, by_fmt) in rendered.items():
+        names[size] = {"width": width}
+        for fmt, data in by_fmt.items():
+            name = variant_name(image_name, size, fmt)
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(data))
+            names[size][fmt] = name
+    names.setdefault("full", {})["jpeg"] = image_name
+    return names
+
+
+def variant_files(variants):
+    """
+    Storage names of the rendered files in an image_variants map. The main
+    image it points at (`full`/`jpeg`) is not included.
+    """
+    main = (variants.get("full") or {}).get("jpeg")
+    return [
+        name
+        for by_fmt in variants.values()
+        for key, name in by_fmt.items()
+        if key != "width" and name != main
+    ]
+
+
+def delete_variants(variants, storage=None):
+    """
+    Delete the rendered files of a replaced image. Failures are logged, not
+    raised: an orphaned variant costs storage, not correctness.
+    """
+    storage = storage or default_storage
+    for name in variant_files(variants):
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception("Could not delete image variant %s", name)
+
+
+def stored_copy_matches(storage, name, data):
+    """
+    True if `name` already holds exactly `data`: same size and, on S3, an ETag
+    equal to the MD5 of `data` (single-part uploads). One HEAD request on S3.
+    """
+    bucket = getattr(storage, "bucket_name", None)
+    if bucket and hasattr(storage, "connection"):
+        from botocore.exceptions import ClientError
+        from storages.utils import clean_name
+
+        key = storage._normalize_name(clean_name(name))
+        try:
+            head = storage.connection.meta.client.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            return False
+        etag = head.get("ETag", "").strip('"')
+        if head.get("ContentLength") != len(data):
+            return False
+        # A multipart ETag isn't an MD5 of the body; size alone has to do.
+        return "-" in etag or etag == hashlib.md5(data).hexdigest()
+    return storage.exists(name) and storage.size(name) == len(data)
+
+
+def save_exact(storage, name, data):
+    """
+    Store `data` under exactly `name`, skipping the upload when an identical
+    copy is already there. Returns True if anything was uploaded.
+    """
+    if stored_copy_matches(storage, name, data):
+        return False
+    if storage.exists(name):
+        # AWS_S3_FILE_OVERWRITE is off; clear the stale copy so the name is kept.
+        storage.delete(name)
+    storage.save(name, ContentFile(data))
+    return True
+
+
+def build_variants(image_name, img=None, storage=None):
+    """
+    Render and store all variants for the stored image `image_name`, decoding
+    it from storage when no already-loaded `img` is passed (backfills).
+    """
+    storage = storage or default_storage
+    if img is None:
+        with storage.open(image_name, "rb") as fh:
+            img = load_upload(fh)
+    return store_variants(image_name, render_variants(img), storage=storage)
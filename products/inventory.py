@@ -15,10 +15,17 @@ Two usage patterns:
 * `adjust_stock(product_id, delta, ...)` / `set_stock(product_id, qty, ...)` —
   standalone helpers that open their own transaction, lock the row, apply the
   change and record it. Use these when you don't already hold a lock.
+
+`apply_deltas(...)` is the batch form of `apply_delta` for callers that lock
+many products at once (e.g. POS checkout) and want a constant number of writes.
+
+Every mutation also calls `catalog_changed()` so cached catalog pages are
+invalidated once the transaction commits (see products.catalog_cache).
 """
 
 from django.db import transaction
 
+from .catalog_cache import catalog_changed
 from .models import Product, StockMovement
 
 # Re-exported so callers don't need to import the model just for the choices.
@@ -61,6 +68,7 @@ def apply_delta(product, delta, *, reason, user=None, reference="", note="", sav
     product.stock = new_balance
     if save:
         product.save(update_fields=["stock"])
+    catalog_changed()
 
     StockMovement.objects.create(
         product=product,
@@ -74,6 +82,46 @@ def apply_delta(product, delta, *, reason, user=None, reference="", note="", sav
     return product
 
 
+def apply_deltas(changes, *, reason, user=None, reference="", note=""):
+    """
+    Bulk form of `apply_delta` for a batch of locked products.
+
+    `changes` is an iterable of `(product, delta)` pairs; the same product may
+    appear more than once and each pair gets its own ledger row, exactly as
+    repeated `apply_delta` calls would. Everything is validated before anything
+    is written, then the touched products are saved with one `bulk_update` and
+    the movements inserted with one `bulk_create`. The caller MUST hold row
+    locks on every product. Raises InsufficientStock on the first line that
+    would drive stock negative.
+    """
+    actor = _resolve_user(user)
+    touched = {}
+    movements = []
+    for product, delta in changes:
+        delta = int(delta)
+        new_balance = product.stock + delta
+        if new_balance < 0:
+            raise InsufficientStock(product, product.stock, -delta)
+        product.stock = new_balance
+        touched[id(product)] = product
+        movements.append(StockMovement(
+            product=product,
+            delta=delta,
+            balance_after=new_balance,
+            reason=reason,
+            reference=reference or "",
+            note=note or "",
+            created_by=actor,
+        ))
+
+    if touched:
+        Product.objects.bulk_update(list(touched.values()), ["stock"])
+        catalog_changed()
+    if movements:
+        StockMovement.objects.bulk_create(movements)
+    return movements
+
+
 def reserve(product, qty, *, save=True):
     """
     Hold `qty` units against a locked product for a not-yet-confirmed order.
@@ -91,6 +139,7 @@ def reserve(product, qty, *, save=True):
     product.reserved += qty
     if save:
         product.save(update_fields=["reserved"])
+    catalog_changed()
     return product
 
 
@@ -107,6 +156,7 @@ def release(product, qty, *, save=True):
     product.reserved = max(0, product.reserved - qty)
     if save:
         product.save(update_fields=["reserved"])
+    catalog_changed()
     return product
 
 
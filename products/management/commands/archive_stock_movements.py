@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.archive import archivable_months, archive_month, cutoff_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Move StockMovement rows older than --keep-months into gzipped CSV "
+        "archives in the default storage, keeping a monthly per-product rollup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-months", type=int, default=12,
+            help="Whole months (besides the current one) kept in the hot table (default: 12).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report what would be archived without writing or deleting anything.",
+        )
+
+    def handle(self, *args, **opts):
+        keep = opts["keep_months"]
+        if keep < 1:
+            raise CommandError("--keep-months must be at least 1.")
+        dry_run = opts["dry_run"]
+
+        cutoff = cutoff_for(keep)
+        months = archivable_months(cutoff)
+        if not months:
+            self.stdout.write(f"Nothing to archive before {cutoff:%Y-%m}.")
+            return
+
+        total = 0
+        for month in months:
+            s = archive_month(month, dry_run=dry_run)
+            total += s["rows"]
+            if dry_run:
+                self.stdout.write(f"  WOULD ARCHIVE {month:%Y-%m}: {s['rows']} rows, {s['products']} products")
+            else:
+                self.stdout.write(
+                    f"  {month:%Y-%m}: {s['rows']} rows, {s['products']} products -> {s['archive_name']}"
+                )
+
+        msg = f"{'Would archive' if dry_run else 'Archived'} {total} rows across {len(months)} month(s)."
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,154 @@
+import csv
+import hashlib
+import io
+import os
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.catalog_cache import catalog_changed
+from products.images import build_variants, encode, load_upload, save_exact
+from products.models import Product
+
+
+def _fetch(source, base_dir, timeout):
+    if source.startswith(("http://", "https://")):
+        req = urllib.request.Request(source, headers={"User-Agent": "fps-attach-images/1.0"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.read()
+    path = source if os.path.isabs(source) else os.path.join(base_dir, source)
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def _prepare(product_id, source, base_dir, timeout, storage):
+    """
+    Fetch, compress and upload one photo plus its variants. Runs in a worker
+    thread and touches storage only; the main thread does the DB write.
+    """
+    img = load_upload(io.BytesIO(_fetch(source, base_dir, timeout)))
+    jpeg = encode(img, "jpeg")
+    # Content-addressed name: re-running on the same photo maps to the same key,
+    # which save_exact() then skips by size/ETag.
+    name = f"products/p{product_id}-{hashlib.md5(jpeg).hexdigest()[:12]}.jpg"
+    uploaded = save_exact(storage, name, jpeg)
+    variants = build_variants(name, img, storage=storage)
+    return name, variants, uploaded
+
+
+class Command(BaseCommand):
+    help = (
+        "Attach product photos in bulk from a CSV of `product_id,source` rows "
+        "(source: http(s) URL or file path, relative to the CSV). Photos are "
+        "fetched, compressed and uploaded concurrently; completed rows are "
+        "recorded in a state file so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads/uploads (default: 8).")
+        parser.add_argument("--timeout", type=float, default=20, help="Per-download timeout in seconds (default: 20).")
+        parser.add_argument(
+            "--state", default=None,
+            help="Resume file of completed rows (default: <csv_path>.done).",
+        )
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Ignore the state file and process every row again.",
+        )
+
+    def _read_rows(self, path):
+        rows = []
+        with open(path, newline="", encoding="utf-8-sig") as fh:
+            for line_no, row in enumerate(csv.reader(fh), 1):
+                if not row or not row[0].strip():
+                    continue
+                pid = row[0].strip()
+                if not pid.isdigit():
+                    if line_no == 1:
+                        continue   # header
+                    raise CommandError(f"Line {line_no}: product id must be an integer, got {pid!r}.")
+                if len(row) < 2 or not row[1].strip():
+                    raise CommandError(f"Line {line_no}: missing image source.")
+                rows.append((int(pid), row[1].strip()))
+        return rows
+
+    def _load_state(self, path):
+        done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    pid, _, source = line.rstrip("\n").partition("\t")
+                    if pid.isdigit() and source:
+                        done.add((int(pid), source))
+        return done
+
+    def handle(self, *args, **opts):
+        path = opts["csv_path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} not found.")
+        if opts["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        base_dir = os.path.dirname(os.path.abspath(path))
+        state_path = opts["state"] or f"{path}.done"
+
+        rows = list(dict.fromkeys(self._read_rows(path)))
+        done = set() if opts["restart"] else self._load_state(state_path)
+        todo = [r for r in rows if r not in done]
+
+        known = set(
+            Product.objects.filter(pk__in={pid for pid, _ in todo}).values_list("id", flat=True)
+        )
+        for pid, source in todo:
+            if pid not in known:
+                self.stderr.write(f"  SKIP product {pid}: not found ({source})")
+        todo = [r for r in todo if r[0] in known]
+
+        self.stdout.write(
+            f"{len(rows)} row(s): {len(rows) - len(todo)} already done or skipped, {len(todo)} to process."
+        )
+        if not todo:
+            return
+
+        storage = Product._meta.get_field("image").storage
+        attached = uploaded = failed = 0
+        pool = ThreadPoolExecutor(max_workers=opts["workers"])
+        try:
+            with open(state_path, "w" if opts["restart"] else "a", encoding="utf-8") as state:
+                futures = {
+                    pool.submit(_prepare, pid, source, base_dir, opts["timeout"], storage): (pid, source)
+                    for pid, source in todo
+                }
+                for fut in as_completed(futures):
+                    pid, source = futures[fut]
+                    try:
+                        name, variants, was_uploaded = fut.result()
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"  ERR  product {pid} ({source}): {exc}")
+                        continue
+                    Product.objects.filter(pk=pid).update(
+                        image=name,
+                        image_variants=variants,
+                        image_status=Product.ImageStatus.READY,
+                        image_queued_at=None,
+                    )
+                    state.write(f"{pid}\t{source}\n")
+                    state.flush()
+                    attached += 1
+                    uploaded += was_uploaded
+                    self.stdout.write(f"  ok   product {pid} -> {name}{'' if was_uploaded else ' (unchanged)'}")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.stderr.write(f"Interrupted after {attached} product(s); re-run to resume.")
+            return
+        finally:
+            pool.shutdown(wait=True)
+            if attached:
+                catalog_changed()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Attached {attached} image(s) ({uploaded} uploaded, {attached - uploaded} already in storage); "
+            f"{failed} failed."
+        ))
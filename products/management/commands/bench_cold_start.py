@@ -0,0 +1,75 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FPSDayalbaghBackend.coldstart import LAUNCHED_AT_ENV
+
+# Phases that happen before the first response is written.
+TO_FIRST_RESPONSE = (
+    "interpreter", "django.setup", "wsgi handler", "app imports",
+    "url resolution", "warm-up", "first response",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold starts: launch fresh interpreters that boot Django and "
+        "serve a GET (default /api/products/), and report the median time per "
+        "phase (see FPSDayalbaghBackend.coldstart)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/products/", help="Path to request (default: /api/products/).")
+        parser.add_argument("--runs", type=int, default=5, help="Fresh processes to launch (default: 5).")
+        parser.add_argument(
+            "--warmup", action="store_true",
+            help="Run with DJANGO_WARMUP=1, as wsgi.py would, to compare against the default.",
+        )
+
+    def _run_once(self, path, warmup):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "FPSDayalbaghBackend.settings")
+        env["DJANGO_WARMUP"] = "1" if warmup else ""
+        env[LAUNCHED_AT_ENV] = repr(time.time())
+        proc = subprocess.run(
+            [sys.executable, "-m", "FPSDayalbaghBackend.coldstart", path],
+            capture_output=True, text=True, env=env,
+        )
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            tail = "\n".join(proc.stderr.strip().splitlines()[-10:])
+            raise CommandError(f"Cold-start run failed:\n{tail}")
+        return json.loads(lines[-1])
+
+    def handle(self, *args, **opts):
+        runs = max(1, opts["runs"])
+        results = [self._run_once(opts["path"], opts["warmup"]) for _ in range(runs)]
+
+        statuses = results[-1]["statuses"]
+        if statuses["first"] >= 400:
+            self.stderr.write(f"Warning: {opts['path']} answered HTTP {statuses['first']}.")
+
+        phases = list(results[0]["phases"])
+        per_phase = {name: [r["phases"].get(name, 0.0) for r in results] for name in phases}
+        to_first = [sum(r["phases"].get(name, 0.0) for name in TO_FIRST_RESPONSE) for r in results]
+
+        self.stdout.write(
+            f"Cold start -> first response for GET {opts['path']} "
+            f"({runs} run(s){', warm-up on' if opts['warmup'] else ''}):\n"
+        )
+        self.stdout.write(f"  {'phase':<18}{'median':>10}{'min':>10}{'max':>10}")
+        for name in phases:
+            values = per_phase[name]
+            self.stdout.write(
+                f"  {name:<18}{1000 * statistics.median(values):>8.1f}ms"
+                f"{1000 * min(values):>8.1f}ms{1000 * max(values):>8.1f}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"\n  process start -> first response: median {1000 * statistics.median(to_first):.1f} ms "
+            f"(min {1000 * min(to_first):.1f} ms)"
+        ))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from FPSDayalbaghBackend.schema import RENDERERS, SCHEMA_DIR, render_schema, schema_key, schema_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-generate the OpenAPI schema served at /api/schema/ (YAML and JSON), "
+        "keyed on the API version. The files are committed; re-run after "
+        "changing a view or serializer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-old", action="store_true",
+            help="Keep schema files built for other versions (default: remove them).",
+        )
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Write nothing; exit with an error if the committed files are out of date.",
+        )
+
+    def handle(self, *args, **opts):
+        key = schema_key()
+        if opts["check"]:
+            stale = []
+            for fmt in RENDERERS:
+                path = schema_path(fmt, key)
+                if not path.exists() or path.read_bytes() != render_schema(fmt):
+                    stale.append(path.name)
+            if stale:
+                raise CommandError(
+                    f"OpenAPI schema out of date: {', '.join(stale)}. "
+                    "Run `manage.py build_openapi_schema` and commit the result."
+                )
+            self.stdout.write(self.style.SUCCESS(f"OpenAPI schema {key} is up to date."))
+            return
+
+        SCHEMA_DIR.mkdir(parents=True, exist_ok=True)
+        written = set()
+        for fmt in RENDERERS:
+            path = schema_path(fmt, key)
+            data = render_schema(fmt)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+            written.add(path)
+            self.stdout.write(f"  wrote {path} ({len(data):,} bytes)")
+
+        if not opts["keep_old"]:
+            for stale in SCHEMA_DIR.glob("openapi-*.*"):
+                if stale not in written:
+                    stale.unlink()
+                    self.stdout.write(f"  removed {stale.name}")
+
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI schema {key} ready."))
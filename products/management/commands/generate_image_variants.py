@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from products.catalog_cache import catalog_changed
+from products.images import build_variants
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Render responsive image variants for products that have an image but none yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Product ids (default: all missing).")
+        parser.add_argument("--force", action="store_true", help="Also process products that already have variants (fills in missing sizes/formats and pixel widths).")
+
+    def handle(self, *args, **opts):
+        qs = Product.objects.exclude(image="").exclude(image__isnull=True).only("id", "image", "image_variants")
+        if opts["ids"]:
+            qs = qs.filter(pk__in=opts["ids"])
+
+        done = failed = 0
+        for p in qs.iterator():
+            if p.image_variants and not opts["force"]:
+                continue
+            try:
+                variants = build_variants(p.image.name)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"  ERR  product {p.id} ({p.image.name}): {exc}")
+                continue
+            Product.objects.filter(pk=p.pk).update(image_variants=variants)
+            done += 1
+            self.stdout.write(f"  ok   product {p.id}")
+
+        if done:
+            catalog_changed()
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {done} product(s); {failed} failed."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from products.image_queue import process_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Compress queued product image uploads and render their responsive "
+        "variants (see products.image_queue)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Process at most N products.")
+        parser.add_argument(
+            "--budget", type=float, default=None,
+            help="Stop starting new products after this many seconds (default: no limit).",
+        )
+        parser.add_argument(
+            "--retry-failed", action="store_true",
+            help="Also retry products whose previous processing failed.",
+        )
+
+    def handle(self, *args, **opts):
+        stats = process_pending(
+            limit=opts["limit"], budget=opts["budget"], retry_failed=opts["retry_failed"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {stats['processed']}, failed {stats['failed']}, "
+            f"skipped {stats['skipped']}; {stats['remaining']} still queued."
+        ))
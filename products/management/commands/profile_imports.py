@@ -0,0 +1,79 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# What a cold serverless instance imports before it can answer a request:
+# the WSGI module (django.setup(), every app's models/signals) and the URLconf
+# (every view module), which Django otherwise loads on the first request.
+COLD_START_SNIPPET = (
+    "import FPSDayalbaghBackend.wsgi\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """[(self_us, cumulative_us, depth, module)] from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((int(m[1]), int(m[2]), len(m[3]) // 2, m[4]))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a cold start in a fresh interpreter under `python -X importtime` "
+        "and summarise where import time goes, by top-level package and by "
+        "slowest individual modules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Rows per table (default: 20).")
+        parser.add_argument(
+            "--code", default=COLD_START_SNIPPET,
+            help="Python to profile instead of the default wsgi + URLconf import.",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=3,
+            help="Profile this many fresh interpreters and report the fastest (default: 3).",
+        )
+
+    def _profile(self, code):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "FPSDayalbaghBackend.settings")
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env,
+        )
+        if proc.returncode != 0:
+            tail = "\n".join(proc.stderr.strip().splitlines()[-10:])
+            raise CommandError(f"Profiled code failed:\n{tail}")
+        return parse_importtime(proc.stderr)
+
+    def handle(self, *args, **opts):
+        runs = [self._profile(opts["code"]) for _ in range(max(1, opts["runs"]))]
+        rows = min(runs, key=lambda r: sum(s for s, _, _, _ in r))
+        total = sum(s for s, _, _, _ in rows)
+
+        by_package = defaultdict(int)
+        for self_us, _, _, module in rows:
+            by_package[module.split(".")[0]] += self_us
+
+        top = opts["top"]
+        self.stdout.write(f"Total import time: {total / 1000:.1f} ms across {len(rows)} modules.\n")
+
+        self.stdout.write("By top-level package (self time):")
+        for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {100 * us / total:5.1f}%  {pkg}")
+
+        self.stdout.write("\nSlowest modules (cumulative, including what they import):")
+        for _, cum, depth, module in sorted(rows, key=lambda r: -r[1])[:top]:
+            self.stdout.write(f"  {cum / 1000:8.1f} ms  {'  ' * min(depth, 6)}{module}")
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.snapshot import SNAPSHOT_KEEP, prune, publish, snapshot_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish the catalog (and one shard per category) as gzipped JSON "
+        "snapshot files for CDN delivery; see products.snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep", type=int, default=SNAPSHOT_KEEP,
+            help=(
+                "Afterwards delete all but the newest N snapshots and their files "
+                f"(default: {SNAPSHOT_KEEP}, CATALOG_SNAPSHOT_KEEP; 0 keeps all)."
+            ),
+        )
+
+    def handle(self, *args, **opts):
+        keep = opts["keep"]
+        if keep < 0:
+            raise CommandError("--keep must be 0 or more.")
+
+        snapshot = publish()
+        storage = snapshot_storage()
+        self.stdout.write(
+            f"  {snapshot.products} products, {len(snapshot.categories)} categories, "
+            f"{snapshot.size:,} bytes gzipped"
+        )
+        self.stdout.write(f"  {storage.url(snapshot.path)}")
+
+        if keep:
+            removed = prune(keep)
+            if removed:
+                self.stdout.write(f"  pruned {removed} older snapshot(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Catalog snapshot {snapshot.key} published."))
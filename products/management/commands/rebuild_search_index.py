@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from products.search import install_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-create the product search index (pg_trgm indexes on PostgreSQL; the "
+        "FTS5 table and its triggers on SQLite, refilled from Product)."
+    )
+
+    def handle(self, *args, **opts):
+        install_index(connection)
+        self.stdout.write(self.style.SUCCESS(f"Search index ready ({connection.vendor})."))
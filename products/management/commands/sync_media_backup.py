@@ -0,0 +1,97 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FPSDayalbaghBackend.s3sync import (
+    MULTIPART_THRESHOLD,
+    Location,
+    Manifest,
+    s3_client_from_env,
+    sync,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync media between S3 buckets and/or a local backup directory. Lists "
+        "both sides once, diffs by key/size/ETag and transfers the differences "
+        "in parallel; a local manifest makes interrupted runs resumable. "
+        "Locations are s3://bucket[/prefix] or a directory path. Examples:\n"
+        "  sync_media_backup s3://product ./supabase_backup --src-env SRC_\n"
+        "  sync_media_backup ./supabase_backup s3://my-bucket --dst-env DST_"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("src")
+        parser.add_argument("dst")
+        parser.add_argument(
+            "--src-env", default="",
+            help="Env var prefix for the source bucket's AWS_* settings, e.g. SRC_ (default: none).",
+        )
+        parser.add_argument(
+            "--dst-env", default="",
+            help="Env var prefix for the destination bucket's AWS_* settings, e.g. DST_ (default: none).",
+        )
+        parser.add_argument("--prefix", default="", help="Only sync keys under this prefix, e.g. products/.")
+        parser.add_argument("--workers", type=int, default=8, help="Parallel transfers (default: 8).")
+        parser.add_argument(
+            "--multipart-mb", type=int, default=MULTIPART_THRESHOLD // (1024 * 1024),
+            help="Objects at least this large use multipart transfers (default: 8).",
+        )
+        parser.add_argument(
+            "--manifest", default=".media_sync_manifest.jsonl",
+            help="Resume manifest path (default: .media_sync_manifest.jsonl). Pass '' to disable.",
+        )
+        parser.add_argument("--force", action="store_true", help="Transfer every object, even unchanged ones.")
+        parser.add_argument("--dry-run", action="store_true", help="List what would be transferred.")
+
+    def _location(self, url, env_prefix):
+        if url.startswith("s3://"):
+            if not url[5:].split("/", 1)[0]:
+                raise CommandError(f"{url}: missing bucket name.")
+            return Location(url, s3_client_from_env(env_prefix))
+        if os.path.exists(url) and not os.path.isdir(url):
+            raise CommandError(f"{url} is not a directory.")
+        return Location(url)
+
+    def handle(self, *args, **opts):
+        if opts["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        src = self._location(opts["src"], opts["src_env"])
+        dst = self._location(opts["dst"], opts["dst_env"])
+        if not src.is_s3 and not os.path.isdir(src.root):
+            raise CommandError(f"Source directory {src.root} not found.")
+
+        manifest = Manifest(opts["manifest"] or None, pair=f"{src.url} -> {dst.url}")
+        dry_run = opts["dry_run"]
+
+        def report(key, entry, error):
+            if error is not None:
+                self.stderr.write(f"  ERR   {key}  {error}")
+            elif dry_run:
+                self.stdout.write(f"  WOULD COPY  {key}  ({entry.size} B)")
+            elif opts["verbosity"] > 1:
+                self.stdout.write(f"  ok    {key}  ({entry.size} B)")
+
+        self.stdout.write(f"{src.url} -> {dst.url}{' (dry run)' if dry_run else ''}")
+        try:
+            stats = sync(
+                src, dst,
+                subprefix=opts["prefix"],
+                manifest=manifest,
+                workers=opts["workers"],
+                force=opts["force"],
+                dry_run=dry_run,
+                multipart_threshold=opts["multipart_mb"] * 1024 * 1024,
+                on_result=report,
+            )
+        except KeyboardInterrupt:
+            raise CommandError("Interrupted; completed transfers are in the manifest, re-run to resume.")
+
+        verb = "would transfer" if dry_run else "transferred"
+        done = stats["to_transfer"] if dry_run else stats["transferred"]
+        msg = (
+            f"{stats['listed']} object(s) listed, {stats['skipped']} unchanged, "
+            f"{done} {verb}, {stats['failed']} failed ({stats['bytes']:,} bytes)."
+        )
+        self.stdout.write(self.style.SUCCESS(msg) if not stats["failed"] else self.style.WARNING(msg))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-19 16:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_reserved'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovementRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('movements', models.PositiveIntegerField(default=0)),
+                ('units_in', models.PositiveIntegerField(default=0)),
+                ('units_out', models.PositiveIntegerField(default=0)),
+                ('closing_balance', models.PositiveIntegerField(default=0)),
+                ('archive_name', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movement_rollups', to='products.product')),
+            ],
+            options={
+                'ordering': ['-month', 'product_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stockmovementrollup',
+            constraint=models.UniqueConstraint(fields=('product', 'month'), name='uniq_stock_rollup_product_month'),
+        ),
+    ]
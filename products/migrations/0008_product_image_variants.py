@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_stockmovementrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
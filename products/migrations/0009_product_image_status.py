@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-19 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='image_status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('pending', 'Pending'), ('processing', 'Processing'), ('failed', 'Failed')], db_index=True, default='ready', max_length=12),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-19 17:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_product_image_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('catalog_version', models.CharField(blank=True, default='', max_length=64)),
+                ('path', models.CharField(max_length=255)),
+                ('categories', models.JSONField(blank=True, default=list)),
+                ('products', models.PositiveIntegerField(default=0)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
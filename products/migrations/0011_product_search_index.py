@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from products.search import install_index
+
+    install_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from products.search import uninstall_index
+
+    uninstall_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """pg_trgm GIN indexes on PostgreSQL, an FTS5 trigram table on SQLite (see products.search)."""
+
+    dependencies = [
+        ('products', '0010_catalogsnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,30 @@
+from django.core.management.commands.createcachetable import Command as CreateCacheTable
+from django.db import migrations
+
+# settings.SHARED_CACHE's LOCATION when the shared tier is database-backed.
+CACHE_TABLE = "fps_cache"
+
+
+def create_cache_table(apps, schema_editor):
+    # Always created, with Django's DatabaseCache schema, whatever cache backend
+    # is configured while migrating: a deploy that drops REDIS_URL later falls
+    # back to this table, and this migration won't run again then.
+    command = CreateCacheTable()
+    command.verbosity = 0   # normally set by handle()
+    command.create_table(schema_editor.connection.alias, CACHE_TABLE, dry_run=False)
+
+
+def drop_cache_table(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {schema_editor.quote_name(CACHE_TABLE)}")
+
+
+class Migration(migrations.Migration):
+    """Database cache table for the shared cache tier (see products.catalog_cache)."""
+
+    dependencies = [
+        ('products', '0011_product_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, drop_cache_table),
+    ]
@@ -1,43 +1,22 @@
-import io
+from functools import partial
 
-from PIL import Image
 from django.conf import settings
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 
-MAX_IMAGE_DIM = 1200   # px on the longest side
-JPEG_QUALITY = 80
-
-
-def _compress_to_jpeg(field_file):
-    img = Image.open(field_file)
-    if img.mode in ("RGBA", "P", "LA"):
-        img = img.convert("RGB")
-    img.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM), Image.Resampling.LANCZOS)
-
-    buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True)
-    buf.seek(0)
-
-    base = field_file.name.rsplit(".", 1)[0] if "." in field_file.name else field_file.name
-    return InMemoryUploadedFile(
-        buf,
-        field_name="image",
-        name=f"{base}.jpg",
-        content_type="image/jpeg",
-        size=buf.getbuffer().nbytes,
-        charset=None,
-    )
-
-
 class Category(models.Model):
     name = models.CharField(max_length=255, unique=True)
     def __str__(self):
         return self.name
 
 class Product(models.Model):
+    class ImageStatus(models.TextChoices):
+        READY = "ready", "Ready"
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        FAILED = "failed", "Failed"
+
     name = models.CharField(max_length=800)
     stock = models.PositiveIntegerField(default=0)
     # Units held by PENDING (placed but not-yet-confirmed) orders. Physical
@@ -47,6 +26,16 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    # Storage names of responsive renditions of `image`:
+    # {"thumb": {"webp": name, "jpeg": name, "width": px}, "medium": {...}, "full": {...}}
+    # See products.images.
+    image_variants = models.JSONField(default=dict, blank=True)
+    # Fresh uploads are stored as-is and queued; products.image_queue swaps in
+    # the compressed JPEG and variants outside the request.
+    image_status = models.CharField(
+        max_length=12, choices=ImageStatus.choices, default=ImageStatus.READY, db_index=True
+    )
+    image_queued_at = models.DateTimeField(null=True, blank=True)
 
     @property
     def available(self):
@@ -54,11 +43,37 @@ class Product(models.Model):
         return max(self.stock - self.reserved, 0)
 
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "image" not in update_fields:
+            return super().save(*args, **kwargs)
+
         # _committed is False only on a freshly-assigned upload; existing S3 files are skipped.
+        # The upload is stored untouched and queued (see products.image_queue):
+        # decoding a large phone photo here could blow the request's time limit.
+        # Variants of the image being replaced are deleted once the save commits.
+        replaced_variants = {}
         if self.image and not getattr(self.image, "_committed", True):
-            self.image = _compress_to_jpeg(self.image)
+            replaced_variants = self.image_variants
+            self.image_status = self.ImageStatus.PENDING
+            self.image_queued_at = timezone.now()
+            self.image_variants = {}
+        elif not self.image:
+            replaced_variants = self.image_variants
+            self.image_status = self.ImageStatus.READY
+            self.image_queued_at = None
+            self.image_variants = {}
+
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields, "image_status", "image_queued_at", "image_variants",
+            }
         super().save(*args, **kwargs)
 
+        if replaced_variants:
+            from .images import delete_variants  # Pillow; keep it off the import path
+
+            transaction.on_commit(partial(delete_variants, replaced_variants))
+
     def __str__(self):
         return f"{self.name} - ₹{self.price}"
 
@@ -108,3 +123,67 @@ class StockMovement(models.Model):
     def __str__(self):
         sign = "+" if self.delta >= 0 else ""
         return f"{self.product_id}: {sign}{self.delta} -> {self.balance_after} ({self.reason})"
+
+
+class StockMovementRollup(models.Model):
+    """
+    Monthly per-product summary of archived `StockMovement` rows.
+
+    When a month of ledger rows is archived (see `products.archive`), the raw
+    rows are written to a gzipped CSV in the default storage and removed from
+    the hot table; one rollup row per product survives so monthly in/out
+    totals and the closing balance stay queryable without the archive.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.PROTECT, related_name="movement_rollups"
+    )
+    # First day of the archived month.
+    month = models.DateField()
+    movements = models.PositiveIntegerField(default=0)
+    units_in = models.PositiveIntegerField(default=0)
+    units_out = models.PositiveIntegerField(default=0)
+    # Balance after the last movement of the month.
+    closing_balance = models.PositiveIntegerField(default=0)
+    # Storage name of the gzipped CSV holding the raw rows.
+    archive_name = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-month", "product_id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "month"], name="uniq_stock_rollup_product_month"
+            ),
+        ]
+
+    @property
+    def net_delta(self):
+        return self.units_in - self.units_out
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.month:%Y-%m}: {self.net_delta:+d} -> {self.closing_balance}"
+
+
+class CatalogSnapshot(models.Model):
+    """
+    One published, immutable copy of the catalog (see `products.snapshot`).
+
+    The full catalog and one shard per category are stored as gzipped JSON
+    under `catalog/snapshots/<key>/`, where `key` is a hash of the catalog
+    payload; the newest row is what `/api/catalog/snapshot/` points clients at.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    catalog_version = models.CharField(max_length=64, blank=True, default="")
+    path = models.CharField(max_length=255)
+    categories = models.JSONField(default=list, blank=True)
+    products = models.PositiveIntegerField(default=0)
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.key} ({self.products} products, {self.created_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,248 @@
+"""
+Ranked, typo-tolerant product search.
+
+`ProductListView?search=` runs `ILIKE '%q%'` over product and category names:
+no index can serve it and results come back alphabetically. `search()` uses
+an index on each database instead:
+
+* PostgreSQL: `pg_trgm` GIN indexes on product and category names. Matches
+  are `q <% name` (word similarity, so "aple" finds "Apple Juice") or a plain
+  substring, ranked by trigram word similarity. Every arm of the match is one
+  the name index (or the category FK index) serves, so Postgres combines them
+  with a BitmapOr instead of scanning the table.
+* SQLite (local/tests): an FTS5 table with the trigram tokenizer, kept in
+  sync by triggers. Candidates sharing any trigram with the query come out
+  of the index and are ranked with the same trigram similarity in Python.
+* Anything else: a substring scan ranked in Python.
+
+The indexes, FTS table and triggers are created by migration 0011 via
+`install_index()`; `manage.py rebuild_search_index` re-creates and refills
+them (SQLite drops a table's triggers whenever a migration rebuilds it).
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import F, Lookup, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import Category, Product
+
+FTS_TABLE = "products_product_fts"
+# How many index candidates to rank per result on SQLite/fallback.
+CANDIDATES_PER_RESULT = 5
+# Category-name matches count for less than product-name matches.
+CATEGORY_WEIGHT = 0.5
+# Minimum word similarity for a non-substring match, on every backend
+# (pg_trgm's own default is 0.6, which rejects e.g. "appel" for "apple").
+WORD_SIMILARITY_THRESHOLD = 0.5
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    return " ".join(_WORD_RE.findall((text or "").lower()))
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two spaces before, one after."""
+    grams = set()
+    for word in normalize(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query, text):
+    """
+    Python counterpart of pg_trgm's word_similarity(query, text): the best
+    share of the query's trigrams found in any single word or the whole text.
+    """
+    query_grams = trigrams(query)
+    if not query_grams:
+        return 0.0
+    candidates = [text, *normalize(text).split()]
+    return max(len(query_grams & trigrams(c)) / len(query_grams) for c in candidates)
+
+
+def _score(query, product):
+    category = product.category.name if product.category_id else ""
+    return max(word_similarity(query, product.name), CATEGORY_WEIGHT * word_similarity(query, category))
+
+
+def _base(category=None):
+    qs = Product.objects.select_related("category")
+    if category:
+        qs = qs.filter(category__name__iexact=category)
+    return qs
+
+
+def _rank(query, products, limit):
+    scored = []
+    for product in products:
+        score = _score(query, product)
+        category = product.category.name if product.category_id else ""
+        if score >= WORD_SIMILARITY_THRESHOLD or query in normalize(f"{product.name} {category}"):
+            scored.append((-score, product.name, product))
+    scored.sort(key=lambda row: row[:2])
+    return [product for _, _, product in scored[:limit]]
+
+
+class _ILike(Lookup):
+    """
+    Plain `lhs ILIKE rhs`. `icontains` compiles to `UPPER(name::text) LIKE
+    UPPER(...)`, which the `gin_trgm_ops` index on `name` can't serve.
+    """
+    lookup_name = "ilike"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+def _search_postgres(query, limit, category):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # Resolved up front: `category_id IN (<list>)` can use the FK index in a
+    # BitmapOr, a subquery can't.
+    matching_categories = list(
+        Category.objects.filter(name__trigram_word_similar=query).values_list("id", flat=True)
+    )
+    pattern = f"%{connection.ops.prep_for_like_query(query)}%"
+    qs = (
+        _base(category)
+        .filter(
+            Q(name__trigram_word_similar=query)
+            | Q(_ILike(F("name"), pattern))
+            | Q(category_id__in=matching_categories)
+        )
+        .annotate(rank=Greatest(
+            TrigramWordSimilarity(query, "name"),
+            TrigramWordSimilarity(query, "category__name") * Value(CATEGORY_WEIGHT),
+        ))
+        .order_by("-rank", "name")[:limit]
+    )
+    # Transaction-local, so it's safe behind a transaction-mode pooler.
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [str(WORD_SIMILARITY_THRESHOLD)],
+        )
+        return list(qs)
+
+
+def _fts_query(query):
+    # The trigram tokenizer indexes unpadded 3-grams; OR them so a typo only
+    # costs the trigrams it touches.
+    grams = set()
+    for word in normalize(query).split():
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return " OR ".join(f'"{g}"' for g in sorted(grams))
+
+
+def _sqlite_has_index():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _search_sqlite(query, limit, category):
+    match = _fts_query(query)
+    if not match or not _sqlite_has_index():
+        return _search_fallback(query, limit, category)
+    # Filter on the indexed category name here, before the candidate cut, so
+    # other categories' matches can't crowd out this one's.
+    where, params = f"{FTS_TABLE} MATCH %s", [match]
+    if category:
+        where += " AND lower(category) = lower(%s)"
+        params.append(category)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {where} "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT %s",
+            [*params, limit * CANDIDATES_PER_RESULT],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return _rank(query, _base(category).filter(pk__in=ids), limit)
+
+
+def _search_fallback(query, limit, category):
+    # Queries shorter than a trigram, or a database without an index.
+    qs = _base(category).filter(Q(name__icontains=query) | Q(category__name__icontains=query))
+    return _rank(query, qs[:limit * CANDIDATES_PER_RESULT], limit)
+
+
+def search(query, *, limit=20, category=None):
+    """Products matching `query`, best match first."""
+    query = normalize(query)
+    if not query:
+        return []
+    if connection.vendor == "postgresql":
+        return _search_postgres(query, limit, category)
+    if connection.vendor == "sqlite" and len(query.replace(" ", "")) >= 3:
+        return _search_sqlite(query, limit, category)
+    return _search_fallback(query, limit, category)
+
+
+# ---- index DDL (migration 0011, rebuild_search_index) ----
+
+POSTGRES_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS products_product_name_trgm "
+    "ON products_product USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS products_category_name_trgm "
+    "ON products_category USING gin (name gin_trgm_ops)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS products_product_name_trgm",
+    "DROP INDEX IF EXISTS products_category_name_trgm",
+]
+
+_CATEGORY_OF_NEW = "(SELECT name FROM products_category WHERE id = new.category_id)"
+SQLITE_INDEX_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(name, category, tokenize = 'trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON products_product BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, category) VALUES (new.id, new.name, {_CATEGORY_OF_NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, category_id ON products_product BEGIN
+        UPDATE {FTS_TABLE} SET name = new.name, category = {_CATEGORY_OF_NEW} WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON products_product BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_cu AFTER UPDATE OF name ON products_category BEGIN
+        UPDATE {FTS_TABLE} SET category = new.name
+        WHERE rowid IN (SELECT id FROM products_product WHERE category_id = new.id);
+    END""",
+    f"DELETE FROM {FTS_TABLE}",
+    f"""INSERT INTO {FTS_TABLE}(rowid, name, category)
+        SELECT p.id, p.name, c.name FROM products_product p
+        JOIN products_category c ON c.id = p.category_id""",
+]
+SQLITE_DROP_SQL = [
+    *(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}" for suffix in ("ai", "au", "ad", "cu")),
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _execute(conn, statements):
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def install_index(conn=None):
+    """Create (or refill) the search index for `conn`'s database."""
+    conn = conn or connection
+    if conn.vendor == "postgresql":
+        _execute(conn, POSTGRES_INDEX_SQL)
+    elif conn.vendor == "sqlite":
+        _execute(conn, SQLITE_INDEX_SQL)
+
+
+def uninstall_index(conn=None):
+    conn = conn or connection
+    if conn.vendor == "postgresql":
+        _execute(conn, POSTGRES_DROP_SQL)
+    elif conn.vendor == "sqlite":
+        _execute(conn, SQLITE_DROP_SQL)
@@ -23,11 +23,17 @@
 
 
 
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from .images import VARIANT_SIZES
 from .models import Product
 
 class ProductSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    # {"thumb": {"webp": url, "jpeg": url, ...}, "medium": {...}, "full": {...}}
+    image_variants = serializers.SerializerMethodField()
+    # {"webp": "url 160w, url 480w, url 1200w", ...} — drop-in for <img srcset>.
+    image_srcset = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     # Units a new customer can order right now (stock minus pending reservations).
     # `stock` remains the physical on-hand count for admin/reporting.
@@ -39,16 +45,58 @@ class ProductSerializer(serializers.ModelSerializer):
             'id', 'name', 'stock', 'available', 'price',
             'category', 'category_name',
             'image', 'image_url',   # keep only fields that exist on the model
+            'image_variants', 'image_srcset', 'image_status',
         ]
+        # Set by Product.save() / products.image_queue, never by clients.
+        read_only_fields = ['image_status']
 
     def get_image_url(self, obj):
-        if obj.image and hasattr(obj.image, 'url'):
-            url = obj.image.url
-            if url.startswith('http'):
-                return url
-            request = self.context.get('request')
-            return request.build_absolute_uri(url) if request else url
-        return None
+        # One .url call per row (hasattr() would evaluate it a second time);
+        # PublicS3Storage makes it a memoised string lookup.
+        if not obj.image:
+            return None
+        url = obj.image.url
+        if url.startswith('http'):
+            return url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def _variant_url(self, name):
+        url = default_storage.url(name)
+        if url.startswith('http'):
+            return url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_image_variants(self, obj):
+        if not obj.image or not obj.image_variants:
+            return None
+        return {
+            size: {
+                key: value if key == "width" else self._variant_url(value)
+                for key, value in by_fmt.items()
+            }
+            for size, by_fmt in obj.image_variants.items()
+        }
+
+    def get_image_srcset(self, obj):
+        variants = self.get_image_variants(obj)
+        if not variants:
+            return None
+        srcset, seen = {}, {}
+        for size, px in VARIANT_SIZES.items():
+            by_fmt = dict(variants.get(size) or {})
+            # Real pixel width; variants built before it was recorded fall
+            # back to the nominal size until regenerated.
+            width = by_fmt.pop("width", px)
+            for fmt, url in by_fmt.items():
+                # Images smaller than a size repeat the same width, and a
+                # srcset may not list one width twice.
+                if width in seen.setdefault(fmt, set()):
+                    continue
+                seen[fmt].add(width)
+                srcset.setdefault(fmt, []).append(f"{url} {width}w")
+        return {fmt: ", ".join(parts) for fmt, parts in srcset.items()}
 
 
 class ProductBulkUpdateItemSerializer(serializers.Serializer):
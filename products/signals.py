@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog_cache import catalog_changed
+from .models import Category, Product
+
+
+# Instance saves/deletes from anywhere (admin, shell, order flows) invalidate
+# cached catalog pages. Bulk writes don't send signals; their call sites call
+# catalog_changed() themselves.
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def _catalog_changed(sender, **kwargs):
+    catalog_changed()
@@ -0,0 +1,185 @@
+"""
+Catalog snapshots for CDN delivery.
+
+The catalog is read far more often than it changes, so besides the live
+`/api/products/` endpoint it is published as static files that clients can
+fetch straight from S3/CDN without invoking Django:
+
+    catalog/snapshots/<key>/catalog.json.gz          every product
+    catalog/snapshots/<key>/category-<id>.json.gz    one per category
+
+Each file is the same JSON list `/api/products/` returns, gzipped, stored
+with `Content-Encoding: gzip` and `Cache-Control: immutable` (the
+"snapshots" storage alias in settings). `key` is a hash of the full
+payload, so a key never changes meaning and republishing unchanged data
+reuses the files already there. A `CatalogSnapshot` row records each
+publish; the newest row is served by `/api/catalog/snapshot/`, the small
+pointer clients poll.
+
+Publishing never runs in a client or admin-edit request. `publish_if_stale()`
+is called by a Vercel cron every few minutes (`GET
+/api/catalog/snapshot/publish/`, see vercel.json) and publishes only when the
+catalog version has moved since the newest snapshot, so however many writes
+(orders move `available` too) land in between, at most one snapshot is
+published per run. Admins can publish right away with a POST to the same
+path, or with `manage.py publish_catalog_snapshot`. Each publish prunes to
+the newest `CATALOG_SNAPSHOT_KEEP` snapshots.
+"""
+import gzip
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.storage import default_storage, storages
+from django.db import IntegrityError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .catalog_cache import SHARED_CACHE, current_version
+from .images import save_exact
+from .models import CatalogSnapshot, Product
+from .serializers import ProductSerializer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "catalog/snapshots"
+SNAPSHOT_STORAGE = getattr(settings, "CATALOG_SNAPSHOT_STORAGE", "snapshots")
+# Longest a publish may hold the lock before another request may retry it.
+PUBLISH_LOCK_SECONDS = getattr(settings, "CATALOG_SNAPSHOT_LOCK_SECONDS", 120)
+PUBLISH_LOCK_KEY = "catalog-snapshot:publish"
+# Snapshots kept after each publish. Clients holding a pruned pointer lose its
+# files, so keep enough to span a few pointer polls.
+SNAPSHOT_KEEP = getattr(settings, "CATALOG_SNAPSHOT_KEEP", 12)
+
+
+def snapshot_storage():
+    """The "snapshots" storage when configured, else the default storage."""
+    if SNAPSHOT_STORAGE in settings.STORAGES:
+        return storages[SNAPSHOT_STORAGE]
+    return default_storage
+
+
+def _gzip(body):
+    # mtime=0 keeps the bytes (and so the stored ETag) stable for equal content.
+    return gzip.compress(body, mtime=0)
+
+
+def publish(catalog_version=None):
+    """
+    Render and store the catalog and its category shards; return the
+    `CatalogSnapshot` for them. Unchanged content reuses the existing row.
+    """
+    if catalog_version is None:
+        catalog_version = current_version() or ""
+    rows = ProductSerializer(
+        Product.objects.select_related("category").order_by("name"), many=True,
+    ).data
+    renderer = JSONRenderer()
+    body = renderer.render(rows)
+    key = hashlib.sha256(body).hexdigest()[:16]
+
+    now = timezone.now()
+    if CatalogSnapshot.objects.filter(key=key).update(catalog_version=catalog_version, created_at=now):
+        return CatalogSnapshot.objects.get(key=key)
+
+    storage = snapshot_storage()
+    base = f"{SNAPSHOT_PREFIX}/{key}"
+    by_category = {}
+    for row in rows:
+        by_category.setdefault(row["category"], (row["category_name"], []))[1].append(row)
+
+    shards = []
+    for category_id, (name, items) in by_category.items():
+        path = f"{base}/category-{category_id}.json.gz"
+        save_exact(storage, path, _gzip(renderer.render(items)))
+        shards.append({"id": category_id, "name": name, "products": len(items), "path": path})
+
+    # The full catalog goes last: a row is only written once every file exists.
+    path = f"{base}/catalog.json.gz"
+    data = _gzip(body)
+    save_exact(storage, path, data)
+
+    try:
+        return CatalogSnapshot.objects.create(
+            key=key, catalog_version=catalog_version, path=path,
+            categories=shards, products=len(rows), size=len(data), created_at=now,
+        )
+    except IntegrityError:
+        # A concurrent publish of the same content won.
+        return CatalogSnapshot.objects.get(key=key)
+
+
+def current_snapshot():
+    """The newest published snapshot, or None if there has never been one."""
+    return CatalogSnapshot.objects.first()
+
+
+def publish_if_stale(force=False):
+    """
+    Publish a snapshot when the catalog version has moved since the newest
+    one (always with `force`), then prune to SNAPSHOT_KEEP. Returns the new
+    snapshot, or None when nothing needed publishing or another run holds
+    the publish lock.
+    """
+    latest = CatalogSnapshot.objects.first()
+    version = current_version()
+    # Without the shared tier the version is unknown; keep what's published.
+    if not force and latest is not None and (version is None or latest.catalog_version == version):
+        return None
+
+    cache = caches[SHARED_CACHE]
+    try:
+        locked = cache.add(PUBLISH_LOCK_KEY, 1, PUBLISH_LOCK_SECONDS)
+    except Exception:
+        # Only the cron and admins get here, so an unlocked publish is rare.
+        logger.warning("Shared cache unavailable; publishing without a lock", exc_info=True)
+        locked = True
+    if not locked:
+        return None
+    try:
+        snapshot = publish(version)
+        if SNAPSHOT_KEEP:
+            prune(SNAPSHOT_KEEP)
+        return snapshot
+    finally:
+        try:
+            cache.delete(PUBLISH_LOCK_KEY)
+        except Exception:
+            pass
+
+
+def pointer(snapshot, storage=None):
+    """The JSON the pointer endpoint returns for `snapshot`."""
+    storage = storage or snapshot_storage()
+    return {
+        "version": snapshot.key,
+        "generated_at": snapshot.created_at,
+        "products": snapshot.products,
+        "url": storage.url(snapshot.path),
+        "categories": [
+            {
+                "id": shard["id"],
+                "name": shard["name"],
+                "products": shard["products"],
+                "url": storage.url(shard["path"]),
+            }
+            for shard in snapshot.categories
+        ],
+    }
+
+
+def prune(keep):
+    """
+    Delete all but the newest `keep` snapshots, files included. Returns the
+    number removed. Clients holding an older pointer lose their files, so
+    keep enough to cover how long apps may go between pointer checks.
+    """
+    storage = snapshot_storage()
+    removed = 0
+    for snapshot in CatalogSnapshot.objects.all()[keep:]:
+        for path in [snapshot.path, *(shard["path"] for shard in snapshot.categories)]:
+            storage.delete(path)
+        snapshot.delete()
+        removed += 1
+    return removed
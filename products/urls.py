@@ -2,19 +2,29 @@
 from django.urls import path
 from .views import (
     ProductListView,
+    ProductSearchView,
+    ProductAutocompleteView,
     ProductDetailView,
     StockExcelUploadView,
     StockExcelDownloadView,
     ProductBulkUpdateView,
+    ProductImageProcessView,
+    CatalogSnapshotView,
+    CatalogSnapshotPublishView,
     DailySalesReportView,
 )
 
 urlpatterns = [
     path("products/", ProductListView.as_view(), name="products-list"),
+    path("products/search/", ProductSearchView.as_view(), name="products-search"),
+    path("products/autocomplete/", ProductAutocompleteView.as_view(), name="products-autocomplete"),
     path("products/<int:pk>/", ProductDetailView.as_view(), name="product-detail"),
     path("products/stock/upload/", StockExcelUploadView.as_view(), name="products-stock-upload"),
     path("products/stock/download/", StockExcelDownloadView.as_view(), name="products-stock-download"),
     path("products/bulk_update/", ProductBulkUpdateView.as_view(), name="products-bulk-update"),
+    path("products/images/process/", ProductImageProcessView.as_view(), name="products-images-process"),
+    path("catalog/snapshot/", CatalogSnapshotView.as_view(), name="catalog-snapshot"),
+    path("catalog/snapshot/publish/", CatalogSnapshotPublishView.as_view(), name="catalog-snapshot-publish"),
     path("reports/daily-sales/", DailySalesReportView.as_view(), name="reports-daily-sales"),
 ]
 
@@ -1,10 +1,10 @@
-import openpyxl
 import re
 from collections import defaultdict
 from decimal import Decimal, InvalidOperation
 
 from django.db import transaction
 
+from .catalog_cache import catalog_changed
 from .models import Category, Product, StockMovement
 
 # Cell values that explicitly mean "no stock / blank", as opposed to a value we
@@ -69,6 +69,8 @@ def process_stock_excel(file_path, user=None):
       * Stock changes are written through the StockMovement audit ledger.
       * The whole reconcile runs in a single transaction.
     """
+    import openpyxl   # deferred: only stock-take uploads need it
+
     wb = openpyxl.load_workbook(file_path, data_only=True)
     sheet = wb.active
 
@@ -223,4 +225,7 @@ def process_stock_excel(file_path, user=None):
         if movements:
             StockMovement.objects.bulk_create(movements)
 
+        if new_cats or new_products or products_to_update:
+            catalog_changed()
+
     return counts
@@ -24,23 +24,30 @@
 from io import BytesIO
 from datetime import datetime, date, timedelta
 from django.utils.timezone import make_aware, get_current_timezone
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Sum, Count
-from django.http import HttpResponse, FileResponse
+from django.http import HttpResponse, HttpResponseNotModified, FileResponse
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView
-from rest_framework.permissions import IsAdminUser
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.utils import timezone
-from openpyxl import Workbook, load_workbook
 import logging
 
 from billing.models import BillingInvoice
 from .models import Product
 from .inventory import apply_delta, Reason
+from .catalog_cache import catalog_changed, get_or_build, request_key
+from FPSDayalbaghBackend import singleflight
+from FPSDayalbaghBackend.cron import IsVercelCron
+from .image_queue import PROCESS_BUDGET_SECONDS, process_pending
+from .snapshot import current_snapshot, pointer, publish_if_stale
+from .search import search
+from .autocomplete import suggest
 from .serializers import (
     ProductSerializer,
     ProductBulkUpdateSerializer,
@@ -48,8 +55,64 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Daily sales report: served from cache for this long, and for up to
+# REPORT_CACHE_STALE more while one request recomputes it.
+REPORT_CACHE_SECONDS = getattr(settings, "REPORT_CACHE_SECONDS", 60)
+REPORT_CACHE_STALE = getattr(settings, "REPORT_CACHE_STALE", 120)
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
+# How long clients/CDNs may reuse the catalog snapshot pointer.
+SNAPSHOT_POINTER_MAX_AGE = getattr(settings, "CATALOG_SNAPSHOT_POINTER_MAX_AGE", 30)
+
 # ---------- Existing products list ----------
+# Most products one ?ids= / POST {"ids": [...]} request may ask for.
+MAX_IDS_PER_REQUEST = 500
+
+
+def _parse_ids(raw):
+    """
+    Product ids from `?ids=1,2,3` (possibly repeated) or a JSON list. Returns a
+    de-duplicated list, or None if anything isn't a positive integer.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, (str, int, float)):
+        raw = [raw]
+    if not isinstance(raw, (list, tuple)):
+        return None
+    ids = []
+    for value in raw:
+        parts = value.split(",") if isinstance(value, str) else [value]
+        for part in parts:
+            if isinstance(part, str):
+                part = part.strip()
+                if not part:
+                    continue
+            # int() would truncate 1.5 to 1 and accept True as 1.
+            if isinstance(part, bool) or (isinstance(part, float) and not part.is_integer()):
+                return None
+            try:
+                pid = int(part)
+            except (TypeError, ValueError, OverflowError):
+                return None
+            if pid < 1:
+                return None
+            ids.append(pid)
+    return list(dict.fromkeys(ids))
+
+
 class ProductListView(ListAPIView):
+    """
+    GET  /api/products/[?category=&search=&ordering=]  -> whole catalog (cached)
+    GET  /api/products/?ids=1,2,3                      -> just those products
+    POST /api/products/  {"ids": [1, 2, 3]}            -> same, for long carts
+
+    The ids variants return the requested products (unknown ids are left out)
+    in one query, with `available`, so a cart can refresh prices and stock in
+    one round-trip.
+    """
     serializer_class = ProductSerializer
     queryset = Product.objects.select_related('category').all()
     filter_backends = [SearchFilter, OrderingFilter]
@@ -62,8 +125,89 @@ class ProductListView(ListAPIView):
         category = self.request.query_params.get('category')
         if category:
             qs = qs.filter(category__name__iexact=category)
+        ids = getattr(self, "requested_ids", None)
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
         return qs
 
+    def _list_ids(self, raw):
+        ids = _parse_ids(raw)
+        if not ids:
+            return Response({"detail": "ids must be a non-empty list of product ids."}, status=400)
+        if len(ids) > MAX_IDS_PER_REQUEST:
+            return Response(
+                {"detail": f"At most {MAX_IDS_PER_REQUEST} ids per request."}, status=400,
+            )
+        self.requested_ids = ids
+        # Not cached: every cart is a different key and would only push
+        # catalog pages out of the per-instance cache.
+        return super().list(self.request)
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response({"detail": 'Send a JSON object: {"ids": [1, 2, 3]}.'}, status=400)
+        return self._list_ids(request.data.get("ids"))
+
+    def list(self, request, *args, **kwargs):
+        if "ids" in request.query_params:
+            return self._list_ids(request.query_params.getlist("ids"))
+        # Same query string -> same payload until the catalog version changes
+        # (products.catalog_cache).
+        data = get_or_build(
+            request_key(request, "products-list"),
+            lambda: super(ProductListView, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+
+class ProductSearchView(APIView):
+    """
+    GET /api/products/search/?q=<text>[&category=<name>][&limit=20]
+
+    Ranked, typo-tolerant search over product and category names (see
+    products.search). Returns the same objects as /api/products/, best match
+    first.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if not q:
+            return Response({"detail": "q is required."}, status=400)
+        try:
+            limit = int(request.query_params.get("limit") or SEARCH_DEFAULT_LIMIT)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=400)
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        category = request.query_params.get("category")
+
+        data = get_or_build(
+            request_key(request, "products-search"),
+            lambda: ProductSerializer(
+                search(q, limit=limit, category=category), many=True, context={"request": request},
+            ).data,
+        )
+        return Response(data)
+
+
+class ProductAutocompleteView(APIView):
+    """
+    GET /api/products/autocomplete/?q=<prefix>[&limit=10]
+
+    As-you-type suggestions from the in-process prefix index (see
+    products.autocomplete): names starting with `q` first, then names with a
+    word starting with `q`. Returns [{id, name, category, price, available}].
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit") or AUTOCOMPLETE_DEFAULT_LIMIT)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=400)
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+        return Response(suggest(request.query_params.get("q") or "", limit))
+
 from rest_framework.generics import RetrieveUpdateAPIView
 
 class ProductDetailView(RetrieveUpdateAPIView):
@@ -76,6 +220,10 @@ class ProductDetailView(RetrieveUpdateAPIView):
     queryset = Product.objects.all()
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        catalog_changed()
+
 
 # ---------- 1) Upload Excel -> Update stock/price ----------
 from .utils import process_stock_excel
@@ -118,6 +266,9 @@ class StockExcelDownloadView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
+        # openpyxl is imported on first export, not on every cold start.
+        from openpyxl import Workbook
+
         wb = Workbook()
         ws = wb.active
         ws.title = "Stock"
@@ -184,6 +335,7 @@ class ProductBulkUpdateView(APIView):
                     if "price" in it:
                         obj.price = it["price"]
                         obj.save(update_fields=["price"])
+                        catalog_changed()
                         changed = True
                     if changed:
                         updated += 1
@@ -193,6 +345,93 @@ class ProductBulkUpdateView(APIView):
         return Response({"ok": True, "updated": updated, "errors": errors})
 
 
+# ---------- 3a) Catalog snapshots for CDN delivery ----------
+class CatalogSnapshotView(APIView):
+    """
+    GET /api/catalog/snapshot/
+
+    Points clients at the newest published catalog snapshot (see
+    products.snapshot): gzipped JSON files on the CDN with the same shape as
+    /api/products/, one for the whole catalog and one per category. The
+    `version` doubles as the ETag; poll with If-None-Match.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        snapshot = current_snapshot()
+        if snapshot is None:
+            # Nothing published yet; the next cron run will.
+            resp = Response({"detail": "Catalog snapshot not published yet."}, status=503)
+            resp["Retry-After"] = "300"
+            return resp
+
+        etag = f'"{snapshot.key}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            resp = HttpResponseNotModified()
+        else:
+            resp = Response(pointer(snapshot))
+        resp["ETag"] = etag
+        resp["Cache-Control"] = f"public, max-age={SNAPSHOT_POINTER_MAX_AGE}"
+        return resp
+
+
+class CatalogSnapshotPublishView(APIView):
+    """
+    GET /api/catalog/snapshot/publish/  (Vercel cron)
+        Publish a snapshot if the catalog changed since the newest one.
+    POST /api/catalog/snapshot/publish/  (admin)
+        Publish one now.
+
+    Either way older snapshots are pruned afterwards (see products.snapshot).
+    """
+    permission_classes = [IsAdminUser | IsVercelCron]
+
+    def get(self, request):
+        return self._publish(force=False)
+
+    def post(self, request):
+        return self._publish(force=True)
+
+    def _publish(self, force):
+        snapshot = publish_if_stale(force=force)
+        latest = snapshot or current_snapshot()
+        return Response({
+            "ok": True,
+            "published": snapshot is not None,
+            "version": latest.key if latest else None,
+        })
+
+
+# ---------- 3b) Drain the image processing queue ----------
+class ProductImageProcessView(APIView):
+    """
+    POST /api/products/images/process/
+    Optional body: {"limit": 10, "retry_failed": true}
+
+    Compresses queued uploads and renders their variants within a time budget
+    (see products.image_queue). Call again while "remaining" > 0.
+
+    GET runs one batch with the defaults; it is what the Vercel cron in
+    vercel.json calls to drain the queue (see FPSDayalbaghBackend/cron.py).
+    """
+    permission_classes = [IsAdminUser | IsVercelCron]
+
+    def get(self, request):
+        stats = process_pending(budget=PROCESS_BUDGET_SECONDS)
+        return Response({"ok": True, **stats})
+
+    def post(self, request):
+        try:
+            limit = int(request.data.get("limit") or 0) or None
+        except (TypeError, ValueError):
+            return Response({"detail": "limit must be an integer."}, status=400)
+        retry_failed = str(request.data.get("retry_failed", "")).lower() in ("1", "true", "yes")
+
+        stats = process_pending(limit=limit, budget=PROCESS_BUDGET_SECONDS, retry_failed=retry_failed)
+        return Response({"ok": True, **stats})
+
+
 # ---------- 4) Daily sales report (JSON or ?format=xlsx) ----------
 # Uses Order / OrderItem from your orders app.
 from orders.models import Order, OrderItem, OrderStatus, OrderSource
@@ -295,6 +534,90 @@ from orders.models import Order, OrderItem, OrderStatus, OrderSource
 #             "by_source": by_source,
 #             "by_product": by_product[:500],  # cap
 #         })
+def _daily_sales(day):
+    """Aggregate one day's paid orders and invoices for DailySalesReportView."""
+    tz = get_current_timezone()
+    start = make_aware(datetime.combine(day, datetime.min.time()), tz)
+    end = start + timedelta(days=1)
+
+    paid_like = [OrderStatus.PAID, OrderStatus.SHIPPED, OrderStatus.COMPLETED]
+
+    orders = (
+        Order.objects
+        .filter(created_at__gte=start, created_at__lt=end, status__in=paid_like)
+        .select_related("user")
+    )
+
+    # Totals
+    orders_count = orders.count()
+    revenue_total = orders.aggregate(s=Sum("total_amount"))["s"] or 0
+
+    # Split by source
+    src = (
+        orders.values("source")
+        .annotate(orders=Count("id"), revenue=Sum("total_amount"))
+        .order_by()
+    )
+    by_source = {
+        row["source"]: {
+            "orders": row["orders"],
+            "revenue": float(row["revenue"] or 0)
+        } for row in src
+    }
+
+    # Split by cashier (POS vs ONLINE)
+    invoices = (
+        BillingInvoice.objects
+        .filter(created_at__gte=start, created_at__lt=end, status=BillingInvoice.STATUS_PAID)
+        .select_related("cashier", "order")
+    )
+
+    by_cashier = []
+    for inv in invoices:
+        if inv.mode == BillingInvoice.MODE_MANUAL:  # POS / Offline
+            cashier_name = inv.cashier.get_username() if inv.cashier else "Unknown"
+        else:  # Online order (no cashier, fallback to order.user if needed)
+            cashier_name = inv.order.user.get_username() if inv.order and inv.order.user else "N/A"
+
+        by_cashier.append({
+            "invoice_id": inv.id,
+            "cashier": cashier_name,
+            "mode": inv.mode,
+            "amount": float(inv.total or 0),
+        })
+
+    # Items aggregation
+    items = (
+        OrderItem.objects
+        .filter(order__in=orders)
+        .select_related("product__category")
+        .values("product_id", "product__name", "product__category__name")
+        .annotate(qty=Sum("quantity"), amount=Sum("line_total"))
+        .order_by("-qty")
+    )
+    by_product = [
+        {
+            "product_id": r["product_id"],
+            "name": r["product__name"],
+            "category": r["product__category__name"],
+            "quantity": int(r["qty"] or 0),
+            "amount": float(r["amount"] or 0),
+        }
+        for r in items
+    ]
+    units_sold = sum(x["quantity"] for x in by_product)
+
+    return {
+        "date": day.isoformat(),
+        "orders": orders_count,
+        "units_sold": units_sold,
+        "revenue": revenue_total,
+        "by_source": by_source,
+        "by_cashier": by_cashier,
+        "by_product": by_product,
+    }
+
+
 class DailySalesReportView(APIView):
     """
     GET params:
@@ -304,7 +627,6 @@ class DailySalesReportView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        tz = get_current_timezone()
         date_str = request.query_params.get("date")
         if date_str:
             y, m, d = map(int, date_str.split("-"))
@@ -312,78 +634,24 @@ class DailySalesReportView(APIView):
         else:
             day = date.today()
 
-        start = make_aware(datetime.combine(day, datetime.min.time()), tz)
-        end = start + timedelta(days=1)
-
-        paid_like = [OrderStatus.PAID, OrderStatus.SHIPPED, OrderStatus.COMPLETED]
-
-        orders = (
-            Order.objects
-            .filter(created_at__gte=start, created_at__lt=end, status__in=paid_like)
-            .select_related("user")
-        )
-
-        # Totals
-        orders_count = orders.count()
-        revenue_total = orders.aggregate(s=Sum("total_amount"))["s"] or 0
-
-        # Split by source
-        src = (
-            orders.values("source")
-            .annotate(orders=Count("id"), revenue=Sum("total_amount"))
-            .order_by()
+        # Concurrent requests for the same day share one computation; see
+        # FPSDayalbaghBackend.singleflight.
+        report = singleflight.get_or_build(
+            f"report:daily-sales:{day.isoformat()}",
+            lambda: _daily_sales(day),
+            fresh=REPORT_CACHE_SECONDS, stale=REPORT_CACHE_STALE, local="default",
         )
-        by_source = {
-            row["source"]: {
-                "orders": row["orders"],
-                "revenue": float(row["revenue"] or 0)
-            } for row in src
-        }
-
-        # Split by cashier (POS vs ONLINE)
-        invoices = (
-            BillingInvoice.objects
-            .filter(created_at__gte=start, created_at__lt=end, status=BillingInvoice.STATUS_PAID)
-            .select_related("cashier", "order")
-        )
-
-        by_cashier = []
-        for inv in invoices:
-            if inv.mode == BillingInvoice.MODE_MANUAL:  # POS / Offline
-                cashier_name = inv.cashier.get_username() if inv.cashier else "Unknown"
-            else:  # Online order (no cashier, fallback to order.user if needed)
-                cashier_name = inv.order.user.get_username() if inv.order and inv.order.user else "N/A"
-
-            by_cashier.append({
-                "invoice_id": inv.id,
-                "cashier": cashier_name,
-                "mode": inv.mode,
-                "amount": float(inv.total or 0),
-            })
-
-        # Items aggregation
-        items = (
-            OrderItem.objects
-            .filter(order__in=orders)
-            .select_related("product__category")
-            .values("product_id", "product__name", "product__category__name")
-            .annotate(qty=Sum("quantity"), amount=Sum("line_total"))
-            .order_by("-qty")
-        )
-        by_product = [
-            {
-                "product_id": r["product_id"],
-                "name": r["product__name"],
-                "category": r["product__category__name"],
-                "quantity": int(r["qty"] or 0),
-                "amount": float(r["amount"] or 0),
-            }
-            for r in items
-        ]
-        units_sold = sum(x["quantity"] for x in by_product)
+        orders_count = report["orders"]
+        units_sold = report["units_sold"]
+        revenue_total = report["revenue"]
+        by_source = report["by_source"]
+        by_cashier = report["by_cashier"]
+        by_product = report["by_product"]
 
         # Excel export
         if request.query_params.get("format") == "xlsx":
+            from openpyxl import Workbook
+
             wb = Workbook()
             ws1 = wb.active
             ws1.title = "Summary"
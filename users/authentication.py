@@ -0,0 +1,72 @@
+"""
+Token authentication with a short-lived cache.
+
+DRF's `TokenAuthentication` loads the `Token` and its `User` (one joined query)
+on every authenticated request. When the shared cache tier is Redis,
+`CachedTokenAuthentication` keeps that pair there for `TOKEN_AUTH_CACHE_TTL`
+seconds (default 60), keyed on a hash of the token so raw keys never end up in
+cache keys. Without Redis `TOKEN_AUTH_CACHE` is None and it behaves exactly
+like `TokenAuthentication`: the database-backed tier would spend a query on
+every hit, no better than the join itself, and several on every miss.
+
+Cached entries are dropped when they stop being valid: whenever a user is
+saved (password reset, deactivation, ...) and whenever a token is deleted, by
+logout, account deletion or in the admin (see users/signals.py). The tier is
+shared by every instance, so a revoked token stops working everywhere at
+once; the TTL only bounds how long a missed invalidation could last. If the
+shared tier errors, requests are authenticated against the database uncached.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+logger = logging.getLogger(__name__)
+
+# Cache alias, or None to disable caching (see settings.TOKEN_AUTH_CACHE).
+TOKEN_AUTH_CACHE = getattr(settings, "TOKEN_AUTH_CACHE", None)
+TOKEN_AUTH_CACHE_TTL = getattr(settings, "TOKEN_AUTH_CACHE_TTL", 60)
+
+
+def _cache_call(method, *args):
+    try:
+        return getattr(caches[TOKEN_AUTH_CACHE], method)(*args)
+    except Exception:
+        logger.warning("Token auth cache %s() failed", method, exc_info=True)
+        return None
+
+
+def _cache_key(key):
+    return "authtoken:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_token(key):
+    """Drop one token's cached (user, token) pair."""
+    if TOKEN_AUTH_CACHE is None:
+        return
+    _cache_call("delete", _cache_key(key))
+
+
+def forget_user_tokens(user):
+    """Drop the cached (user, token) pairs of every token belonging to `user`."""
+    if TOKEN_AUTH_CACHE is None:
+        return
+    keys = Token.objects.filter(user_id=user.pk).values_list("key", flat=True)
+    _cache_call("delete_many", [_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        if TOKEN_AUTH_CACHE is None:
+            return super().authenticate_credentials(key)
+        cache_key = _cache_key(key)
+        cached = _cache_call("get", cache_key)
+        if cached is not None:
+            return cached
+        # Invalid/inactive tokens raise here and are never cached.
+        user, token = super().authenticate_credentials(key)
+        _cache_call("set", cache_key, (user, token), TOKEN_AUTH_CACHE_TTL)
+        return user, token
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_token, forget_user_tokens
+
+User = get_user_model()
+
+
+# Any change to the user (password, is_active, name, ...) makes the cached
+# copy stale. Login's last_login bump is the exception: nothing reads it off
+# request.user, and it would cost an extra query on every login.
+@receiver(post_save, sender=User)
+def _forget_tokens_on_user_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    forget_user_tokens(instance)
+
+
+@receiver(post_delete, sender=Token)
+def _forget_deleted_token(sender, instance, **kwargs):
+    forget_token(instance.key)
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import RegisterView, LoginView, PasswordResetView, DeleteAccountView
+from .views import RegisterView, LoginView, LogoutView, PasswordResetView, DeleteAccountView
 
 urlpatterns = [
     path('register/', RegisterView.as_view()),
     path('login/', LoginView.as_view()),
+    path('logout/', LogoutView.as_view()),
     path('password-reset/', PasswordResetView.as_view()),
     path('delete-account/', DeleteAccountView.as_view()),
 ]
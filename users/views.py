@@ -153,7 +153,7 @@ from django.contrib.auth import authenticate
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
 
 from .serializers import RegisterSerializer, LoginSerializer, UserSerializer
@@ -217,6 +217,17 @@ class LoginView(APIView):
         )
 
 
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # Revoke the token this request authenticated with (its cached copy is
+        # dropped by users/signals.py).
+        if isinstance(request.auth, Token):
+            request.auth.delete()
+        return Response({"message": "Logged out."}, status=status.HTTP_200_OK)
+
+
 class PasswordResetView(APIView):
     permission_classes = [AllowAny]
 